@@ -5,9 +5,14 @@ Run with: streamlit run app.py
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
 import json
+import time
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 # Configure page
@@ -25,6 +30,12 @@ logger = logging.getLogger(__name__)
 # API configuration
 API_URL = "http://127.0.0.1:8000"
 
+_UTC = timezone.utc
+
+def _iso_now() -> str:
+    """Second-resolution UTC timestamp without per-call locale/tz lookups."""
+    return datetime.now(_UTC).isoformat(timespec="seconds")
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -35,113 +46,246 @@ if "api_connected" not in st.session_state:
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _get_session() -> requests.Session:
+    """Return one pooled Session per user session (keep-alive instead of a new TCP connection per helper)."""
+    if "http" not in st.session_state:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        st.session_state.http = session
+    return st.session_state.http
+
+def _get_etagged(path, timeout=5):
+    """GET with If-None-Match; reuse the cached body when the server replies 304."""
+    cache = st.session_state.setdefault("etag_cache", {})
+    headers = {}
+    cached = cache.get(path)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    response = _get_session().get(f"{API_URL}{path}", timeout=timeout, headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if response.status_code == 200:
+        etag = response.headers.get("ETag")
+        data = response.json()
+        if etag:
+            cache[path] = (etag, data)
+        return data
+    return None
+
+async def _fetch_json(client, path):
+    """Fetch one endpoint on a shared async client."""
+    try:
+        response = await client.get(path)
+        if response.status_code == 200:
+            return response.json()
+    except Exception as e:
+        logger.error(f"Failed to fetch {path}: {e}")
+    return []
+
+def _fetch_many(*paths):
+    """Fetch several endpoints concurrently so page load pays max-of-RTTs, not sum."""
+    async def _gather():
+        async with httpx.AsyncClient(base_url=API_URL, timeout=5) as client:
+            return await asyncio.gather(*(_fetch_json(client, path) for path in paths))
+    return asyncio.run(_gather())
+
+@st.cache_data(ttl=15, show_spinner=False)
+def bootstrap():
+    """Fetch status plus all lists in one round-trip, shared by every page."""
+    try:
+        response = _get_session().get(f"{API_URL}/bootstrap", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+    except Exception as e:
+        logger.error(f"Failed to bootstrap: {e}")
+    return None
+
+@st.cache_data(ttl=5, show_spinner=False)
 def check_api_health():
-    """Check if API is running."""
+    """Check if API is running (cached so every rerun doesn't pay the probe)."""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = _get_session().get(f"{API_URL}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_operational_status():
     """Fetch operational status from API."""
     try:
-        response = requests.get(f"{API_URL}/status", timeout=5)
+        response = _get_session().get(f"{API_URL}/status", timeout=5)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
         logger.error(f"Failed to get status: {e}")
     return None
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_pilots():
     """Fetch all pilots from API."""
     try:
-        response = requests.get(f"{API_URL}/pilots", timeout=5)
-        if response.status_code == 200:
-            return response.json()
+        data = _get_etagged("/pilots")
+        if data is not None:
+            return data
     except Exception as e:
         logger.error(f"Failed to get pilots: {e}")
     return []
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_drones():
     """Fetch all drones from API."""
     try:
-        response = requests.get(f"{API_URL}/drones", timeout=5)
-        if response.status_code == 200:
-            return response.json()
+        data = _get_etagged("/drones")
+        if data is not None:
+            return data
     except Exception as e:
         logger.error(f"Failed to get drones: {e}")
     return []
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_missions():
     """Fetch all missions from API."""
     try:
-        response = requests.get(f"{API_URL}/missions", timeout=5)
-        if response.status_code == 200:
-            return response.json()
+        data = _get_etagged("/missions")
+        if data is not None:
+            return data
     except Exception as e:
         logger.error(f"Failed to get missions: {e}")
     return []
 
-def get_available_pilots():
-    """Fetch available pilots."""
-    try:
-        response = requests.get(f"{API_URL}/pilots/available", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except Exception as e:
-        logger.error(f"Failed to get available pilots: {e}")
-    return []
-
-def get_available_drones():
-    """Fetch available drones."""
-    try:
-        response = requests.get(f"{API_URL}/drones/available", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except Exception as e:
-        logger.error(f"Failed to get available drones: {e}")
-    return []
-
-def send_chat_message(message: str) -> str:
-    """Send message to chat API and get response."""
+def stream_chat_message(message: str):
+    """Stream the agent response chunk-by-chunk from the SSE endpoint."""
     try:
-        response = requests.post(
-            f"{API_URL}/chat",
-            json={"content": message, "timestamp": datetime.now().isoformat()},
-            timeout=10
+        response = _get_session().post(
+            f"{API_URL}/chat/stream",
+            json={"content": message, "timestamp": _iso_now()},
+            stream=True,
+            timeout=30
         )
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("message", "No response from agent")
+        if response.status_code != 200:
+            yield f"Error communicating with agent: HTTP {response.status_code}"
+            return
+        for line in response.iter_lines():
+            if not line:
+                continue
+            line = line.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+            payload = line[len("data: "):]
+            if payload == "[DONE]":
+                break
+            yield json.loads(payload).get("delta", "")
     except Exception as e:
         logger.error(f"Chat API error: {e}")
-        return f"Error communicating with agent: {str(e)}"
-    return "API error"
+        yield f"Error communicating with agent: {str(e)}"
+
+def _poll_task(task_id: str, timeout: float = 30):
+    """Poll /tasks/{id} until the background computation finishes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = _get_session().get(f"{API_URL}/tasks/{task_id}", timeout=5)
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+        if payload.get("done"):
+            return payload.get("result")
+        time.sleep(0.2)
+    return None
 
 def propose_assignment(mission_id: str):
-    """Propose assignment for mission."""
+    """Propose assignment for mission (computed server-side in the background)."""
     try:
-        response = requests.post(
+        response = _get_session().post(
             f"{API_URL}/assign?mission_id={mission_id}",
             timeout=10
         )
         if response.status_code == 200:
-            return response.json()
+            return _poll_task(response.json()["task_id"])
     except Exception as e:
         logger.error(f"Assignment error: {e}")
     return None
 
 def check_conflicts():
-    """Check for system conflicts."""
+    """Check for system conflicts (computed server-side in the background)."""
     try:
-        response = requests.get(f"{API_URL}/conflicts/check", timeout=10)
+        response = _get_session().get(f"{API_URL}/conflicts/check", timeout=10)
         if response.status_code == 200:
-            return response.json()
+            result = _poll_task(response.json()["task_id"])
+            if result is not None:
+                return result
     except Exception as e:
         logger.error(f"Conflict check error: {e}")
     return {"conflicts": []}
 
+# ============================================================================
+# DATAFRAME BUILDERS (column-oriented: one pass per column, no per-row dicts)
+# ============================================================================
+
+def _pilots_df(pilots):
+    return pd.DataFrame({
+        "ID": [p.get("pilot_id") for p in pilots],
+        "Name": [p.get("name") for p in pilots],
+        "Skills": [", ".join(p.get("skills", [])) for p in pilots],
+        "Certifications": [", ".join(p.get("certifications", [])) for p in pilots],
+        "Location": [p.get("location") for p in pilots],
+        "Status": [p.get("status") for p in pilots],
+        "Current Assignment": [p.get("current_assignment", "None") for p in pilots]
+    })
+
+def _available_pilots_df(pilots):
+    return pd.DataFrame({
+        "Name": [p.get("name") for p in pilots],
+        "Skills": [", ".join(p.get("skills", [])) for p in pilots],
+        "Location": [p.get("location") for p in pilots],
+        "Available From": [p.get("available_from") for p in pilots]
+    })
+
+def _drones_df(drones):
+    return pd.DataFrame({
+        "ID": [d.get("drone_id") for d in drones],
+        "Model": [d.get("model") for d in drones],
+        "Capabilities": [", ".join(d.get("capabilities", [])) for d in drones],
+        "Status": [d.get("status") for d in drones],
+        "Location": [d.get("location") for d in drones],
+        "Current Assignment": [d.get("current_assignment", "None") for d in drones],
+        "Maintenance Due": [d.get("maintenance_due") for d in drones]
+    })
+
+def _available_drones_df(drones):
+    return pd.DataFrame({
+        "Model": [d.get("model") for d in drones],
+        "Capabilities": [", ".join(d.get("capabilities", [])) for d in drones],
+        "Location": [d.get("location") for d in drones],
+        "Maintenance Due": [d.get("maintenance_due") for d in drones]
+    })
+
+def _missions_df(missions):
+    return pd.DataFrame({
+        "ID": [m.get("project_id") for m in missions],
+        "Client": [m.get("client") for m in missions],
+        "Location": [m.get("location") for m in missions],
+        "Required Skills": [", ".join(m.get("required_skills", [])) for m in missions],
+        "Required Certs": [", ".join(m.get("required_certs", [])) for m in missions],
+        "Start": [m.get("start_date") for m in missions],
+        "End": [m.get("end_date") for m in missions],
+        "Priority": [m.get("priority") for m in missions]
+    })
+
+def _invalidate_data_caches():
+    """Clear only the data fetch caches; fragments rerender without a full rerun."""
+    bootstrap.clear()
+    get_pilots.clear()
+    get_drones.clear()
+    get_missions.clear()
+    get_operational_status.clear()
+
 # ============================================================================
 # PAGE HEADER
 # ============================================================================
@@ -181,15 +325,16 @@ with st.sidebar:
     st.divider()
     
     if st.button("🔄 Refresh Data", use_container_width=True):
+        st.cache_data.clear()
         st.rerun()
     
     if st.button("🔄 Sync from Google Sheets", use_container_width=True):
         try:
-            response = requests.post(f"{API_URL}/sync/google-sheets", timeout=10)
+            response = _get_session().post(f"{API_URL}/sync/google-sheets", timeout=10)
             if response.status_code == 200:
                 result = response.json()
                 st.success(f"✅ Synced from Google Sheets: {result.get('message', '')}")
-                st.rerun()
+                _invalidate_data_caches()
             else:
                 st.error(f"❌ Sync failed: {response.status_code}")
         except Exception as e:
@@ -197,10 +342,11 @@ with st.sidebar:
     
     if st.button("📤 Sync to Google Sheets", use_container_width=True):
         try:
-            response = requests.post(f"{API_URL}/sync/to-google-sheets", timeout=10)
+            response = _get_session().post(f"{API_URL}/sync/to-google-sheets", timeout=10)
             if response.status_code == 200:
                 result = response.json()
                 st.success(f"✅ Synced to Google Sheets: {result.get('message', '')}")
+                _invalidate_data_caches()
             else:
                 st.error(f"❌ Sync failed: {response.status_code}")
         except Exception as e:
@@ -210,7 +356,8 @@ with st.sidebar:
 # PAGE: CHAT AGENT
 # ============================================================================
 
-if page == "Chat Agent":
+@st.fragment
+def render_chat():
     st.header("💬 AI Coordinator Agent")
     st.markdown("Ask me anything about assignments, availability, or conflicts!")
     
@@ -219,8 +366,10 @@ if page == "Chat Agent":
         with st.chat_message(message["role"]):
             st.write(message["content"])
     
-    # Chat input
-    if user_input := st.chat_input("Ask me about pilot assignments, drone status, etc..."):
+    # Chat input (skipped while disconnected - no point waiting out a guaranteed timeout)
+    if not st.session_state.api_connected:
+        st.warning("API disconnected — start the backend to enable chat")
+    elif user_input := st.chat_input("Ask me about pilot assignments, drone status, etc..."):
         # Add user message to history
         st.session_state.messages.append({
             "role": "user",
@@ -231,28 +380,26 @@ if page == "Chat Agent":
         with st.chat_message("user"):
             st.write(user_input)
         
-        # Get agent response
-        with st.spinner("🤖 Coordinator thinking..."):
-            response = send_chat_message(user_input)
+        # Stream agent response as it arrives
+        with st.chat_message("assistant"):
+            response = st.write_stream(stream_chat_message(user_input))
         
         # Add assistant message to history
         st.session_state.messages.append({
             "role": "assistant",
             "content": response
         })
-        
-        # Display assistant message
-        with st.chat_message("assistant"):
-            st.write(response)
 
 # ============================================================================
 # PAGE: DASHBOARD
 # ============================================================================
 
-elif page == "Dashboard":
+@st.fragment
+def render_dashboard():
     st.header("📊 Operations Dashboard")
-    
-    status = get_operational_status()
+
+    data = bootstrap()
+    status = data["status"] if data else get_operational_status()
     
     if status:
         # Metrics
@@ -287,40 +434,27 @@ elif page == "Dashboard":
 # PAGE: PILOTS
 # ============================================================================
 
-elif page == "Pilots":
+@st.fragment
+def render_pilots():
     st.header("👨‍✈️ Pilot Roster")
     
+    data = bootstrap()
+    if data:
+        pilots, available = data["pilots"], data["available_pilots"]
+    else:
+        pilots, available = _fetch_many("/pilots", "/pilots/available")
+
     tab1, tab2 = st.tabs(["All Pilots", "Available Only"])
-    
+
     with tab1:
-        pilots = get_pilots()
         if pilots:
-            # Convert to DataFrame
-            df = pd.DataFrame([{
-                "ID": p.get("pilot_id"),
-                "Name": p.get("name"),
-                "Skills": ", ".join(p.get("skills", [])),
-                "Certifications": ", ".join(p.get("certifications", [])),
-                "Location": p.get("location"),
-                "Status": p.get("status"),
-                "Current Assignment": p.get("current_assignment", "None")
-            } for p in pilots])
-            
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(_pilots_df(pilots), use_container_width=True)
         else:
             st.info("No pilot data available")
     
     with tab2:
-        available = get_available_pilots()
         if available:
-            df = pd.DataFrame([{
-                "Name": p.get("name"),
-                "Skills": ", ".join(p.get("skills", [])),
-                "Location": p.get("location"),
-                "Available From": p.get("available_from")
-            } for p in available])
-            
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(_available_pilots_df(available), use_container_width=True)
         else:
             st.info("No available pilots")
 
@@ -328,39 +462,27 @@ elif page == "Pilots":
 # PAGE: DRONES
 # ============================================================================
 
-elif page == "Drones":
+@st.fragment
+def render_drones():
     st.header("🚁 Drone Fleet")
     
+    data = bootstrap()
+    if data:
+        drones, available = data["drones"], data["available_drones"]
+    else:
+        drones, available = _fetch_many("/drones", "/drones/available")
+
     tab1, tab2 = st.tabs(["All Drones", "Available Only"])
-    
+
     with tab1:
-        drones = get_drones()
         if drones:
-            df = pd.DataFrame([{
-                "ID": d.get("drone_id"),
-                "Model": d.get("model"),
-                "Capabilities": ", ".join(d.get("capabilities", [])),
-                "Status": d.get("status"),
-                "Location": d.get("location"),
-                "Current Assignment": d.get("current_assignment", "None"),
-                "Maintenance Due": d.get("maintenance_due")
-            } for d in drones])
-            
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(_drones_df(drones), use_container_width=True)
         else:
             st.info("No drone data available")
     
     with tab2:
-        available = get_available_drones()
         if available:
-            df = pd.DataFrame([{
-                "Model": d.get("model"),
-                "Capabilities": ", ".join(d.get("capabilities", [])),
-                "Location": d.get("location"),
-                "Maintenance Due": d.get("maintenance_due")
-            } for d in available])
-            
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(_available_drones_df(available), use_container_width=True)
         else:
             st.info("No available drones")
 
@@ -368,23 +490,14 @@ elif page == "Drones":
 # PAGE: MISSIONS
 # ============================================================================
 
-elif page == "Missions":
+@st.fragment
+def render_missions():
     st.header("📋 Missions")
-    
-    missions = get_missions()
+
+    data = bootstrap()
+    missions = data["missions"] if data else get_missions()
     if missions:
-        df = pd.DataFrame([{
-            "ID": m.get("project_id"),
-            "Client": m.get("client"),
-            "Location": m.get("location"),
-            "Required Skills": ", ".join(m.get("required_skills", [])),
-            "Required Certs": ", ".join(m.get("required_certs", [])),
-            "Start": m.get("start_date"),
-            "End": m.get("end_date"),
-            "Priority": m.get("priority")
-        } for m in missions])
-        
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(_missions_df(missions), use_container_width=True)
         
         # Assignment helper
         st.divider()
@@ -396,7 +509,7 @@ elif page == "Missions":
             format_func=lambda x: next((m.get("client") for m in missions if m.get("project_id") == x), x)
         )
         
-        if st.button("Find Best Assignment"):
+        if st.button("Find Best Assignment", disabled=not st.session_state.api_connected):
             with st.spinner("Finding best assignment..."):
                 proposal = propose_assignment(selected_mission)
                 if proposal:
@@ -414,10 +527,11 @@ elif page == "Missions":
 # PAGE: CONFLICTS
 # ============================================================================
 
-elif page == "Conflicts":
+@st.fragment
+def render_conflicts():
     st.header("⚠️ Conflict Detection")
     
-    if st.button("Check for Conflicts", use_container_width=True):
+    if st.button("Check for Conflicts", use_container_width=True, disabled=not st.session_state.api_connected):
         with st.spinner("Scanning for conflicts..."):
             conflicts_data = check_conflicts()
             
@@ -442,6 +556,21 @@ elif page == "Conflicts":
                         st.write(f"**Affected Items:** {', '.join(conflict.get('affected_items', []))}")
                         st.write(f"**Recommendation:** {conflict.get('recommendation', 'N/A')}")
 
+# ============================================================================
+# PAGE DISPATCH
+# ============================================================================
+
+_PAGES = {
+    "Chat Agent": render_chat,
+    "Dashboard": render_dashboard,
+    "Pilots": render_pilots,
+    "Drones": render_drones,
+    "Missions": render_missions,
+    "Conflicts": render_conflicts
+}
+
+_PAGES[page]()
+
 # ============================================================================
 # FOOTER
 # ============================================================================
@@ -3,20 +3,23 @@ Drone Operations Coordinator Backend
 FastAPI + OpenAI + Google Sheets Integration
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import json
 import logging
-from typing import List, Optional
+import os
+import time
+from uuid import uuid4
 
 # Import services
 from services.coordinator_agent import CoordinatorAgent
 from services.data_manager import DataManager
 from services.conflict_engine import ConflictEngine
-from models import (
-    PilotData, DroneData, MissionData, 
-    AssignmentProposal, ChatMessage, ChatResponse
-)
+from models import ChatMessage, ChatResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,29 +29,58 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Drone Operations Coordinator API",
     description="AI-powered drone fleet management system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware for Streamlit communication
+# Add CORS middleware for Streamlit communication.
+# Wildcard origins + credentials is a spec violation browsers reject anyway,
+# so restrict to the local Streamlit frontend.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=["http://127.0.0.1:8501", "http://localhost:8501"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+class SSEAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves server-sent-event endpoints alone.
+
+    Starlette's gzip wrapper buffers instead of flushing per chunk, which
+    would turn the token stream into one burst at completion.
+    """
+
+    EXEMPT_PATHS = ("/chat/stream",)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress list payloads; small responses and the SSE stream are left alone
+app.add_middleware(SSEAwareGZipMiddleware, minimum_size=500, compresslevel=5)
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Echo (or mint) an X-Request-ID so responses can be correlated in logs."""
+    request_id = request.headers.get("x-request-id") or uuid4().hex
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Initialize services
 data_manager = DataManager()
 conflict_engine = ConflictEngine()
-coordinator_agent = CoordinatorAgent()
+coordinator_agent = CoordinatorAgent(data_manager=data_manager)
 
 # ============================================================================
 # HEALTH CHECK ENDPOINTS
 # ============================================================================
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """API health status."""
     return {
         "status": "healthy",
@@ -57,15 +89,15 @@ def health_check():
     }
 
 @app.get("/status")
-def get_status():
+async def get_status():
     """Get current operational status."""
     try:
-        pilots = data_manager.get_pilots()
-        drones = data_manager.get_drones()
-        missions = data_manager.get_missions()
+        pilots = await asyncio.to_thread(data_manager.get_pilots)
+        drones = await asyncio.to_thread(data_manager.get_drones)
+        missions = await asyncio.to_thread(data_manager.get_missions)
         
-        available_pilots = [p for p in pilots if p.status == "Available"]
-        available_drones = [d for d in drones if d.status == "Available"]
+        available_pilots = data_manager.get_available_pilots()
+        available_drones = data_manager.get_available_drones()
         
         return {
             "total_pilots": len(pilots),
@@ -80,109 +112,185 @@ def get_status():
         logger.error(f"Status check failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/bootstrap")
+async def get_bootstrap():
+    """Single snapshot for the frontend: status plus all lists in one response."""
+    try:
+        pilots = await asyncio.to_thread(data_manager.get_pilots)
+        drones = await asyncio.to_thread(data_manager.get_drones)
+        missions = await asyncio.to_thread(data_manager.get_missions)
+
+        available_pilots = data_manager.get_available_pilots()
+        available_drones = data_manager.get_available_drones()
+
+        return {
+            "status": {
+                "total_pilots": len(pilots),
+                "available_pilots": len(available_pilots),
+                "total_drones": len(drones),
+                "available_drones": len(available_drones),
+                "total_missions": len(missions),
+                "last_sync": data_manager.last_sync_time,
+                "data_source": "google_sheets" if data_manager.last_sync_time else "csv_fallback"
+            },
+            "pilots": pilots,
+            "available_pilots": available_pilots,
+            "drones": drones,
+            "available_drones": available_drones,
+            "missions": missions
+        }
+    except Exception as e:
+        logger.error(f"Bootstrap failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================================================
 # DATA ENDPOINTS
 # ============================================================================
 
-@app.get("/pilots", response_model=List[PilotData])
-def get_all_pilots():
-    """Get all pilots."""
+@app.get("/pilots")
+async def get_all_pilots(request: Request):
+    """Get all pilots (pre-serialized in DataManager)."""
     try:
-        return data_manager.get_pilots()
+        etag = f'W/"{data_manager.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        body = await asyncio.to_thread(data_manager.pilots_json)
+        return Response(body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to get pilots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/drones", response_model=List[DroneData])
-def get_all_drones():
-    """Get all drones."""
+@app.get("/drones")
+async def get_all_drones(request: Request):
+    """Get all drones (pre-serialized in DataManager)."""
     try:
-        return data_manager.get_drones()
+        etag = f'W/"{data_manager.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        body = await asyncio.to_thread(data_manager.drones_json)
+        return Response(body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to get drones: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/missions", response_model=List[MissionData])
-def get_all_missions():
-    """Get all missions."""
+@app.get("/missions")
+async def get_all_missions(request: Request):
+    """Get all missions (pre-serialized in DataManager)."""
     try:
-        return data_manager.get_missions()
+        etag = f'W/"{data_manager.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        body = await asyncio.to_thread(data_manager.missions_json)
+        return Response(body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to get missions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/pilots/available")
-def get_available_pilots():
+async def get_available_pilots():
     """Get available pilots."""
     try:
-        pilots = data_manager.get_pilots()
-        return [p for p in pilots if p.status == "Available"]
+        return await asyncio.to_thread(data_manager.get_available_pilots)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/drones/available")
-def get_available_drones():
+async def get_available_drones():
     """Get available drones."""
     try:
-        drones = data_manager.get_drones()
-        return [d for d in drones if d.status == "Available"]
+        return await asyncio.to_thread(data_manager.get_available_drones)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
-# ASSIGNMENT ENDPOINTS
+# ASSIGNMENT ENDPOINTS (background tasks, polled via /tasks/{id})
 # ============================================================================
 
-@app.post("/assign", response_model=AssignmentProposal)
-def propose_assignment(mission_id: str):
-    """Propose best assignment for a mission."""
-    try:
-        mission = data_manager.get_mission_by_id(mission_id)
-        if not mission:
-            raise HTTPException(status_code=404, detail="Mission not found")
-        
-        pilots = data_manager.get_pilots()
-        drones = data_manager.get_drones()
-        
-        # Find best assignment
-        best_assignment = conflict_engine.find_best_assignment(mission, pilots, drones)
-        
-        if not best_assignment:
-            raise HTTPException(status_code=400, detail="No suitable pilot-drone pairing found")
-        
-        return best_assignment
-    except Exception as e:
-        logger.error(f"Assignment proposal failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+# In-flight background computations as task_id -> (task, created_at);
+# entries are dropped when fetched, or swept once the TTL expires so a
+# client that times out or crashes mid-poll can't leak results forever
+_tasks: dict = {}
+_TASK_TTL_SECONDS = 300.0
+
+def _sweep_tasks():
+    """Drop (and cancel) tasks whose results were never claimed in time."""
+    cutoff = time.monotonic() - _TASK_TTL_SECONDS
+    for task_id, (task, created_at) in list(_tasks.items()):
+        if created_at < cutoff:
+            task.cancel()
+            _tasks.pop(task_id, None)
+
+def _run_conflict_scan(pilots, drones, missions):
+    """Worker for the background conflict scan."""
+    conflicts = conflict_engine.detect_all_conflicts(pilots, drones, missions)
+    return {"total_conflicts": len(conflicts), "conflicts": conflicts}
+
+@app.post("/assign")
+async def propose_assignment(mission_id: str):
+    """Start a background assignment search; poll /tasks/{task_id} for the result."""
+    mission = await asyncio.to_thread(data_manager.get_mission_by_id, mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    
+    pilots = await asyncio.to_thread(data_manager.get_pilots)
+    drones = await asyncio.to_thread(data_manager.get_drones)
+    
+    _sweep_tasks()
+    task_id = uuid4().hex
+    task = asyncio.create_task(
+        asyncio.to_thread(conflict_engine.find_best_assignment, mission, pilots, drones)
+    )
+    _tasks[task_id] = (task, time.monotonic())
+    return {"task_id": task_id}
 
 @app.get("/conflicts/check")
-def check_conflicts():
-    """Check for scheduling and capability conflicts."""
-    try:
-        pilots = data_manager.get_pilots()
-        drones = data_manager.get_drones()
-        missions = data_manager.get_missions()
-        
-        conflicts = conflict_engine.detect_all_conflicts(pilots, drones, missions)
-        return {"total_conflicts": len(conflicts), "conflicts": conflicts}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def check_conflicts():
+    """Start a background conflict scan; poll /tasks/{task_id} for the result."""
+    pilots = await asyncio.to_thread(data_manager.get_pilots)
+    drones = await asyncio.to_thread(data_manager.get_drones)
+    missions = await asyncio.to_thread(data_manager.get_missions)
+    
+    _sweep_tasks()
+    task_id = uuid4().hex
+    task = asyncio.create_task(
+        asyncio.to_thread(_run_conflict_scan, pilots, drones, missions)
+    )
+    _tasks[task_id] = (task, time.monotonic())
+    return {"task_id": task_id}
+
+@app.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Poll a background task; the entry is dropped once its result is fetched."""
+    _sweep_tasks()
+    entry = _tasks.get(task_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task = entry[0]
+    if not task.done():
+        return {"done": False, "result": None}
+    
+    _tasks.pop(task_id, None)
+    exc = task.exception()
+    if exc is not None:
+        logger.error(f"Background task failed: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc))
+    return {"done": True, "result": task.result()}
 
 # ============================================================================
 # CHAT/AI AGENT ENDPOINTS
 # ============================================================================
 
 @app.post("/chat", response_model=ChatResponse)
-def chat_with_agent(message: ChatMessage):
+async def chat_with_agent(message: ChatMessage):
     """Send message to AI coordinator agent."""
     try:
         # Load current data context
-        pilots = data_manager.get_pilots()
-        drones = data_manager.get_drones()
-        missions = data_manager.get_missions()
+        pilots = await asyncio.to_thread(data_manager.get_pilots)
+        drones = await asyncio.to_thread(data_manager.get_drones)
+        missions = await asyncio.to_thread(data_manager.get_missions)
         
-        # Get response from OpenAI
-        response = coordinator_agent.process_query(
+        # Get response from OpenAI without tying up a worker thread
+        response = await coordinator_agent.process_query_async(
             user_message=message.content,
             pilots=pilots,
             drones=drones,
@@ -197,15 +305,44 @@ def chat_with_agent(message: ChatMessage):
         logger.error(f"Chat processing failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/chat/stream")
+async def chat_with_agent_stream(message: ChatMessage):
+    """Stream the agent response to the frontend as server-sent events."""
+    pilots = await asyncio.to_thread(data_manager.get_pilots)
+    drones = await asyncio.to_thread(data_manager.get_drones)
+    missions = await asyncio.to_thread(data_manager.get_missions)
+
+    async def event_stream():
+        try:
+            # Pull tokens off the sync OpenAI stream without blocking the loop
+            generator = coordinator_agent.process_query_stream(
+                user_message=message.content,
+                pilots=pilots,
+                drones=drones,
+                missions=missions
+            )
+            sentinel = object()
+            while True:
+                delta = await asyncio.to_thread(next, generator, sentinel)
+                if delta is sentinel:
+                    break
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream failed: {e}")
+            yield f"data: {json.dumps({'delta': f'Error: {e}'})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 # ============================================================================
 # SYNC ENDPOINTS
 # ============================================================================
 
 @app.post("/sync/google-sheets")
-def sync_from_google_sheets():
+async def sync_from_google_sheets():
     """Force sync from Google Sheets."""
     try:
-        result = data_manager.sync_from_google_sheets()
+        result = await asyncio.to_thread(data_manager.sync_from_google_sheets)
         return {
             "status": "success",
             "message": "Data synced from Google Sheets",
@@ -216,10 +353,10 @@ def sync_from_google_sheets():
         raise HTTPException(status_code=500, detail=f"Google Sheets sync failed: {str(e)}")
 
 @app.post("/sync/to-google-sheets")
-def sync_to_google_sheets():
+async def sync_to_google_sheets():
     """Sync local changes back to Google Sheets."""
     try:
-        result = data_manager.sync_to_google_sheets()
+        result = await asyncio.to_thread(data_manager.sync_to_google_sheets)
         return {
             "status": "success",
             "message": "Data synced to Google Sheets",
@@ -235,9 +372,26 @@ def sync_to_google_sheets():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True
-    )
+    
+    debug = bool(os.getenv("DEBUG"))
+    if debug:
+        # Dev mode: file-watcher reload, single worker, default loop
+        uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    else:
+        try:
+            import uvloop  # noqa: F401 - not available on Windows
+            loop = "uvloop"
+        except ImportError:
+            loop = "asyncio"
+        # Single worker by default: background task results, the DataManager
+        # snapshot and the agent's conversation history are all per-process
+        # state, so extra workers would answer polls and syncs inconsistently
+        uvicorn.run(
+            "main:app",
+            host="127.0.0.1",
+            port=8000,
+            loop=loop,
+            http="httptools",
+            workers=int(os.getenv("WORKERS", "1")),
+            reload=False
+        )
@@ -2,11 +2,20 @@
 Pydantic models for data validation and API responses
 """
 
-from pydantic import BaseModel, Field
+import sys
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
+def _date_ord(value: str) -> int:
+    """Epoch-day ordinal for a YYYY-MM-DD string, or -1 when unparseable."""
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return -1
+
 # ============================================================================
 # ENUMS
 # ============================================================================
@@ -46,8 +55,66 @@ class PilotData(BaseModel):
     current_assignment: Optional[str] = Field(None, description="Current mission ID")
     available_from: str = Field(..., description="Date pilot available")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True, extra="ignore")
+
+    _skills_set: frozenset = PrivateAttr(default=frozenset())
+    _certs_set: frozenset = PrivateAttr(default=frozenset())
+    _skills_lc: tuple = PrivateAttr(default=())
+    _certs_lc: tuple = PrivateAttr(default=())
+    _available_from_ord: int = PrivateAttr(default=-1)
+    _location_lc: str = PrivateAttr(default="")
+    _skills_blob: str = PrivateAttr(default="||")
+    _certs_blob: str = PrivateAttr(default="||")
+
+    def model_post_init(self, __context) -> None:
+        self._skills_set = frozenset(self.skills)
+        self._certs_set = frozenset(self.certifications)
+        self._skills_lc = tuple(s.lower() for s in self.skills)
+        self._certs_lc = tuple(c.lower() for c in self.certifications)
+        self._available_from_ord = _date_ord(self.available_from)
+        self._location_lc = sys.intern(self.location.casefold())
+        self._skills_blob = "|" + "|".join(self._skills_lc) + "|"
+        self._certs_blob = "|" + "|".join(self._certs_lc) + "|"
+
+    @property
+    def skills_set(self) -> frozenset:
+        """Skills as a frozenset for O(1) membership checks."""
+        return self._skills_set
+
+    @property
+    def certs_set(self) -> frozenset:
+        """Certifications as a frozenset for O(1) membership checks."""
+        return self._certs_set
+
+    @property
+    def skills_lc(self) -> tuple:
+        """Skills lowercased once at construction for substring matching."""
+        return self._skills_lc
+
+    @property
+    def certs_lc(self) -> tuple:
+        """Certifications lowercased once at construction for substring matching."""
+        return self._certs_lc
+
+    @property
+    def available_from_ord(self) -> int:
+        """available_from as an epoch-day ordinal (-1 if unparseable)."""
+        return self._available_from_ord
+
+    @property
+    def location_lc(self) -> str:
+        """Location casefolded and interned; equal locations share identity."""
+        return self._location_lc
+
+    @property
+    def skills_blob(self) -> str:
+        """All lowercased skills joined "|a|b|" for one-scan substring checks."""
+        return self._skills_blob
+
+    @property
+    def certs_blob(self) -> str:
+        """All lowercased certifications joined "|a|b|" for one-scan checks."""
+        return self._certs_blob
 
 class DroneData(BaseModel):
     """Drone fleet entry."""
@@ -59,8 +126,38 @@ class DroneData(BaseModel):
     current_assignment: Optional[str] = Field(None, description="Current mission ID")
     maintenance_due: str = Field(..., description="Next maintenance due date")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True, extra="ignore")
+
+    _capabilities_lc: tuple = PrivateAttr(default=())
+    _capabilities_lc_set: frozenset = PrivateAttr(default=frozenset())
+    _location_lc: str = PrivateAttr(default="")
+    _capabilities_blob: str = PrivateAttr(default="||")
+
+    def model_post_init(self, __context) -> None:
+        self._capabilities_lc = tuple(c.lower() for c in self.capabilities)
+        self._capabilities_lc_set = frozenset(self._capabilities_lc)
+        self._location_lc = sys.intern(self.location.casefold())
+        self._capabilities_blob = "|" + "|".join(self._capabilities_lc) + "|"
+
+    @property
+    def capabilities_lc(self) -> tuple:
+        """Capabilities lowercased once at construction for substring matching."""
+        return self._capabilities_lc
+
+    @property
+    def capabilities_lc_set(self) -> frozenset:
+        """Lowercased capabilities as a frozenset for exact-keyword checks."""
+        return self._capabilities_lc_set
+
+    @property
+    def location_lc(self) -> str:
+        """Location casefolded and interned; equal locations share identity."""
+        return self._location_lc
+
+    @property
+    def capabilities_blob(self) -> str:
+        """Lowercased capabilities joined "|a|b|" for one-scan substring checks."""
+        return self._capabilities_blob
 
 class MissionData(BaseModel):
     """Mission/project entry."""
@@ -73,13 +170,66 @@ class MissionData(BaseModel):
     end_date: str = Field(..., description="Mission end date")
     priority: MissionPriority = Field(default=MissionPriority.STANDARD)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True, extra="ignore")
+
+    _required_skills_set: frozenset = PrivateAttr(default=frozenset())
+    _required_certs_set: frozenset = PrivateAttr(default=frozenset())
+    _required_skills_lc: tuple = PrivateAttr(default=())
+    _required_certs_lc: tuple = PrivateAttr(default=())
+    _start_ord: int = PrivateAttr(default=-1)
+    _end_ord: int = PrivateAttr(default=-1)
+    _location_lc: str = PrivateAttr(default="")
+
+    def model_post_init(self, __context) -> None:
+        self._required_skills_set = frozenset(self.required_skills)
+        self._required_certs_set = frozenset(self.required_certs)
+        self._required_skills_lc = tuple(s.lower() for s in self.required_skills)
+        self._required_certs_lc = tuple(c.lower() for c in self.required_certs)
+        self._start_ord = _date_ord(self.start_date)
+        self._end_ord = _date_ord(self.end_date)
+        self._location_lc = sys.intern(self.location.casefold())
+
+    @property
+    def required_skills_set(self) -> frozenset:
+        """Required skills as a frozenset for O(1) membership checks."""
+        return self._required_skills_set
+
+    @property
+    def required_certs_set(self) -> frozenset:
+        """Required certifications as a frozenset for O(1) membership checks."""
+        return self._required_certs_set
+
+    @property
+    def required_skills_lc(self) -> tuple:
+        """Required skills lowercased once at construction."""
+        return self._required_skills_lc
+
+    @property
+    def required_certs_lc(self) -> tuple:
+        """Required certifications lowercased once at construction."""
+        return self._required_certs_lc
+
+    @property
+    def start_ord(self) -> int:
+        """start_date as an epoch-day ordinal (-1 if unparseable)."""
+        return self._start_ord
+
+    @property
+    def end_ord(self) -> int:
+        """end_date as an epoch-day ordinal (-1 if unparseable)."""
+        return self._end_ord
+
+    @property
+    def location_lc(self) -> str:
+        """Location casefolded and interned; equal locations share identity."""
+        return self._location_lc
 
 # ============================================================================
 # CONFLICT & ASSIGNMENT MODELS
 # ============================================================================
 
+_SEVERITY_CODES = {"low": 0, "medium": 1, "high": 2}
+
 class ConflictCheck(BaseModel):
     """Individual conflict check result."""
     check_type: str = Field(..., description="Type of conflict check")
@@ -87,6 +237,19 @@ class ConflictCheck(BaseModel):
     message: str = Field(..., description="Detailed conflict message")
     resolved: bool = Field(default=False)
 
+    # Frozen so the engine can share singleton success instances safely
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+    _severity_code: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context) -> None:
+        self._severity_code = _SEVERITY_CODES.get(self.severity, 0)
+
+    @property
+    def severity_code(self) -> int:
+        """Severity as an int (0=low, 1=medium, 2=high) for table lookups."""
+        return self._severity_code
+
 class AssignmentProposal(BaseModel):
     """Proposed pilot-drone assignment for a mission."""
     mission: MissionData
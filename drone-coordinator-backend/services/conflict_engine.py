@@ -2,20 +2,118 @@
 Conflict detection engine - rule-based system for identifying conflicts
 """
 
+import heapq
 import logging
+import re
 from typing import List, Optional
 from datetime import datetime
 
+import numpy as np
+
 from models import (
-    PilotData, DroneData, MissionData,
+    PilotData, DroneData, MissionData, PilotStatus, DroneStatus,
     ConflictCheck, AssignmentProposal, ConflictDetectionResult
 )
 
 logger = logging.getLogger(__name__)
 
+# Hoisted enum values so availability checks can't drift from the enums
+_PILOT_AVAIL = PilotStatus.AVAILABLE.value
+_DRONE_AVAIL = DroneStatus.AVAILABLE.value
+
+def _overlap_pairs(assignments):
+    """Index pairs (i, j), i < j, of assignments whose date ranges overlap.
+    
+    Evaluates the whole overlap matrix in NumPy instead of a Python
+    double loop; entries with unparseable dates (ordinal -1) are skipped.
+    """
+    n = len(assignments)
+    starts = np.fromiter((m.start_ord for m in assignments), dtype=np.int64, count=n)
+    ends = np.fromiter((m.end_ord for m in assignments), dtype=np.int64, count=n)
+    valid = (starts >= 0) & (ends >= 0)
+    mask = (
+        (starts[:, None] <= ends[None, :])
+        & (starts[None, :] <= ends[:, None])
+        & valid[:, None] & valid[None, :]
+    )
+    ii, jj = np.triu(mask, k=1).nonzero()
+    return zip(ii.tolist(), jj.tolist())
+
+# Severity penalties indexed by ConflictCheck.severity_code (0=low, 1=medium,
+# 2=high): tuple indexing replaces dict hashing on every scored conflict
+_PENALTY = (0, 15, 40)
+
+def _score_kernel(sev, resolved):
+    """Feasibility score from packed severity codes (0=low, 1=medium, 2=high).
+    
+    Kept free of dicts and Python objects so Numba can JIT-compile it when
+    available; the interpreted fallback runs the same loop.
+    """
+    penalty = 0
+    crit = 0
+    for i in range(sev.shape[0]):
+        if resolved[i]:
+            continue
+        s = sev[i]
+        penalty += 0 if s == 0 else 15 if s == 1 else 40
+        crit += s == 2
+    return max(0.0, 100.0 - penalty - 20.0 * crit)
+
+try:
+    from numba import njit  # optional accelerator, not a hard dependency
+    _score_kernel = njit(cache=True)(_score_kernel)
+except ImportError:
+    pass
+
+# Shared success results: the happy path returns these singletons instead of
+# validating a fresh Pydantic instance per (pilot, drone) pair
+_SKILL_OK = ConflictCheck(
+    check_type="skill_match", severity="low",
+    message="All required skills present", resolved=True
+)
+_CERT_OK = ConflictCheck(
+    check_type="certification_match", severity="low",
+    message="All required certifications present", resolved=True
+)
+_LOCATION_OK = ConflictCheck(
+    check_type="location_match", severity="low",
+    message="Pilot location matches mission", resolved=True
+)
+_AVAILABILITY_OK = ConflictCheck(
+    check_type="availability_ok", severity="low",
+    message="Pilot available", resolved=True
+)
+_DRONE_OK = ConflictCheck(
+    check_type="drone_available", severity="low",
+    message="Drone available", resolved=True
+)
+_CAP_NOT_REQUIRED = ConflictCheck(
+    check_type="capability_not_required", severity="low",
+    message="No specific capabilities required", resolved=True
+)
+_CAP_OK = ConflictCheck(
+    check_type="capability_match", severity="low",
+    message="Drone has required capabilities", resolved=True
+)
+_DRONE_LOCATION_OK = ConflictCheck(
+    check_type="drone_location_match", severity="low",
+    message="Drone location matches mission", resolved=True
+)
+
 class ConflictEngine:
     """Rule-based conflict detection and assignment feasibility scoring."""
     
+    # Mission-skill keywords that map to drone capabilities: one compiled
+    # alternation scans each skill string instead of a keyword double-loop
+    _CAP_RE = re.compile(r"thermal|lidar|rgb|hyperspectral|4k")
+    _CAP_DISPLAY = {
+        "thermal": "Thermal",
+        "lidar": "LiDAR",
+        "rgb": "RGB",
+        "hyperspectral": "Hyperspectral",
+        "4k": "4K",
+    }
+    
     def __init__(self, feasibility_threshold: float = 50):
         """Initialize conflict engine with threshold."""
         self.feasibility_threshold = feasibility_threshold
@@ -27,172 +125,136 @@ class ConflictEngine:
     def check_skill_match(self, pilot: PilotData, mission: MissionData) -> ConflictCheck:
         """Check if pilot has required skills."""
         missing_skills = []
-        for req_skill in mission.required_skills:
-            has_skill = any(
-                req_skill.lower() in s.lower() 
-                for s in pilot.skills
-            )
-            if not has_skill:
-                missing_skills.append(req_skill)
+        if not mission.required_skills_set.issubset(pilot.skills_set):
+            skills_blob = pilot.skills_blob
+            for req_skill, req_lc in zip(mission.required_skills, mission.required_skills_lc):
+                # Exact matches hit the frozenset; partial names like
+                # "Thermal" vs "Thermal Imaging" fall back to one C-level
+                # substring scan over the "|"-joined blob
+                if req_skill in pilot.skills_set:
+                    continue
+                if req_lc not in skills_blob:
+                    missing_skills.append(req_skill)
         
         if missing_skills:
-            return ConflictCheck(
+            return ConflictCheck.model_construct(
                 check_type="skill_mismatch",
                 severity="high",
                 message=f"Pilot missing skills: {', '.join(missing_skills)}"
             )
         
-        return ConflictCheck(
-            check_type="skill_match",
-            severity="low",
-            message=f"All required skills present",
-            resolved=True
-        )
+        return _SKILL_OK
     
     def check_certifications(self, pilot: PilotData, mission: MissionData) -> ConflictCheck:
         """Check if pilot has required certifications."""
         missing_certs = []
-        for req_cert in mission.required_certs:
-            has_cert = any(
-                req_cert.lower() in c.lower()
-                for c in pilot.certifications
-            )
-            if not has_cert:
-                missing_certs.append(req_cert)
+        if not mission.required_certs_set.issubset(pilot.certs_set):
+            certs_blob = pilot.certs_blob
+            for req_cert, req_lc in zip(mission.required_certs, mission.required_certs_lc):
+                if req_cert in pilot.certs_set:
+                    continue
+                if req_lc not in certs_blob:
+                    missing_certs.append(req_cert)
         
         if missing_certs:
-            return ConflictCheck(
+            return ConflictCheck.model_construct(
                 check_type="certification_mismatch",
                 severity="high",
                 message=f"Pilot missing certifications: {', '.join(missing_certs)}"
             )
         
-        return ConflictCheck(
-            check_type="certification_match",
-            severity="low",
-            message=f"All required certifications present",
-            resolved=True
-        )
+        return _CERT_OK
     
     def check_location_match(self, pilot: PilotData, mission: MissionData) -> ConflictCheck:
         """Check if pilot location matches mission location."""
-        if pilot.location.lower() != mission.location.lower():
-            return ConflictCheck(
+        # Locations are casefolded and interned at construction, so identity
+        # comparison is equality with no per-call lower() allocations
+        if pilot.location_lc is not mission.location_lc:
+            return ConflictCheck.model_construct(
                 check_type="location_mismatch",
                 severity="medium",
                 message=f"Location mismatch: {pilot.location} vs {mission.location}"
             )
         
-        return ConflictCheck(
-            check_type="location_match",
-            severity="low",
-            message=f"Location match: {pilot.location}",
-            resolved=True
-        )
+        return _LOCATION_OK
     
     def check_pilot_availability(self, pilot: PilotData, mission: MissionData) -> ConflictCheck:
         """Check if pilot is available for mission dates."""
-        if pilot.status != "Available":
-            return ConflictCheck(
+        if pilot.status != _PILOT_AVAIL:
+            return ConflictCheck.model_construct(
                 check_type="pilot_unavailable",
                 severity="high",
                 message=f"Pilot status: {pilot.status}. Available from: {pilot.available_from}"
             )
         
         # Check if available_from date is before mission start
-        try:
-            available_date = datetime.strptime(pilot.available_from, "%Y-%m-%d")
-            mission_start = datetime.strptime(mission.start_date, "%Y-%m-%d")
-            
-            if available_date > mission_start:
-                return ConflictCheck(
+        # (epoch-day ordinals pre-parsed at construction; -1 means unparseable)
+        if pilot.available_from_ord >= 0 and mission.start_ord >= 0:
+            if pilot.available_from_ord > mission.start_ord:
+                return ConflictCheck.model_construct(
                     check_type="availability_conflict",
                     severity="high",
                     message=f"Pilot available {pilot.available_from}, mission starts {mission.start_date}"
                 )
-        except ValueError:
-            logger.warning("Date parsing failed - skipping date check")
-        
-        return ConflictCheck(
-            check_type="availability_ok",
-            severity="low",
-            message=f"Pilot available",
-            resolved=True
-        )
+        
+        return _AVAILABILITY_OK
     
     def check_drone_availability(self, drone: DroneData) -> ConflictCheck:
         """Check if drone is available."""
-        if drone.status != "Available":
-            return ConflictCheck(
+        if drone.status != _DRONE_AVAIL:
+            return ConflictCheck.model_construct(
                 check_type="drone_unavailable",
                 severity="high",
                 message=f"Drone status: {drone.status}. Maintenance due: {drone.maintenance_due}"
             )
         
-        return ConflictCheck(
-            check_type="drone_available",
-            severity="low",
-            message=f"Drone available",
-            resolved=True
-        )
+        return _DRONE_OK
     
     def check_drone_capabilities(self, drone: DroneData, mission: MissionData) -> ConflictCheck:
         """Check if drone has required capabilities."""
-        # Map mission skills to drone capabilities
-        capability_keywords = ['Thermal', 'LiDAR', 'RGB', 'Hyperspectral', '4K']
-        required_capabilities = []
-        
-        for skill in mission.required_skills:
-            for keyword in capability_keywords:
-                if keyword.lower() in skill.lower():
-                    required_capabilities.append(keyword)
+        # Map mission skills to drone capabilities (deduped, order-preserving)
+        required_capabilities = [
+            self._CAP_DISPLAY[match] for match in dict.fromkeys(
+                m.group(0)
+                for skill in mission.required_skills_lc
+                for m in self._CAP_RE.finditer(skill)
+            )
+        ]
         
         if not required_capabilities:
-            return ConflictCheck(
-                check_type="capability_not_required",
-                severity="low",
-                message="No specific capabilities required",
-                resolved=True
-            )
+            return _CAP_NOT_REQUIRED
         
         missing_capabilities = []
+        capabilities_blob = drone.capabilities_blob
         for req_cap in required_capabilities:
-            has_cap = any(
-                req_cap.lower() in cap.lower()
-                for cap in drone.capabilities
-            )
-            if not has_cap:
+            req_lc = req_cap.lower()
+            # Whole-word capabilities hit the frozenset; the "|"-joined blob
+            # covers the substring fallback in one scan
+            if req_lc in drone.capabilities_lc_set:
+                continue
+            if req_lc not in capabilities_blob:
                 missing_capabilities.append(req_cap)
         
         if missing_capabilities:
-            return ConflictCheck(
+            return ConflictCheck.model_construct(
                 check_type="capability_mismatch",
                 severity="high",
                 message=f"Drone missing capabilities: {', '.join(missing_capabilities)}"
             )
         
-        return ConflictCheck(
-            check_type="capability_match",
-            severity="low",
-            message=f"Drone has required capabilities",
-            resolved=True
-        )
+        return _CAP_OK
     
     def check_drone_location(self, drone: DroneData, mission: MissionData) -> ConflictCheck:
         """Check if drone location matches mission."""
-        if drone.location.lower() != mission.location.lower():
-            return ConflictCheck(
+        # Interned casefolded locations: identity comparison is equality
+        if drone.location_lc is not mission.location_lc:
+            return ConflictCheck.model_construct(
                 check_type="drone_location_mismatch",
                 severity="medium",
                 message=f"Drone location mismatch: {drone.location} vs {mission.location}"
             )
         
-        return ConflictCheck(
-            check_type="drone_location_match",
-            severity="low",
-            message=f"Drone location match: {drone.location}",
-            resolved=True
-        )
+        return _DRONE_LOCATION_OK
     
     # ========================================================================
     # FEASIBILITY SCORING
@@ -203,62 +265,45 @@ class ConflictEngine:
         if not conflicts:
             return 100.0
         
-        # Severity penalties
-        severity_penalties = {
-            "low": 0,
-            "medium": 15,
-            "high": 40
-        }
-        
-        total_penalty = 0
-        critical_issues = 0
-        
-        for conflict in conflicts:
-            if conflict.resolved:
-                continue  # Don't penalize resolved conflicts
-            
-            penalty = severity_penalties.get(conflict.severity, 0)
-            total_penalty += penalty
-            
-            if conflict.severity == "high":
-                critical_issues += 1
-        
-        # Exponential penalty for multiple critical issues
-        if critical_issues > 0:
-            total_penalty += critical_issues * 20
-        
-        feasibility_score = max(0, 100 - total_penalty)
-        return round(feasibility_score, 1)
+        n = len(conflicts)
+        sev = np.fromiter((c.severity_code for c in conflicts), dtype=np.int8, count=n)
+        resolved = np.fromiter((c.resolved for c in conflicts), dtype=np.bool_, count=n)
+        return _score_kernel(sev, resolved)
     
     # ========================================================================
     # ASSIGNMENT PROPOSAL GENERATION
     # ========================================================================
     
-    def propose_assignment(
-        self, mission: MissionData, pilot: PilotData, drone: DroneData
-    ) -> Optional[AssignmentProposal]:
-        """Propose a single pilot-drone assignment for a mission."""
+    def _pilot_checks(self, pilot: PilotData, mission: MissionData) -> tuple:
+        """Run the pilot-only checks for a (pilot, mission) pair.
+        
+        Returns (conflicts, penalty) so a grid scan can share the results
+        across every drone considered with this pilot.
+        """
         conflicts = [
             self.check_skill_match(pilot, mission),
             self.check_certifications(pilot, mission),
             self.check_location_match(pilot, mission),
             self.check_pilot_availability(pilot, mission),
-            self.check_drone_availability(drone),
-            self.check_drone_capabilities(drone, mission),
-            self.check_drone_location(drone, mission),
         ]
-        
-        feasibility = self.calculate_feasibility_score(conflicts)
-        
-        # Filter to unresolved conflicts only
-        unresolved_conflicts = [c for c in conflicts if not c.resolved]
-        
-        # Generate reasoning
+        penalty = 0
+        for conflict in conflicts:
+            if conflict.resolved:
+                continue
+            penalty += _PENALTY[conflict.severity_code]
+            if conflict.severity_code == 2:
+                penalty += 20
+        return conflicts, penalty
+    
+    def _build_reasoning(
+        self, feasibility: float, unresolved_conflicts: List[ConflictCheck]
+    ) -> str:
+        """Human-readable reasoning for a proposal's score and conflicts."""
         reasoning_parts = []
         if feasibility >= self.feasibility_threshold:
-            reasoning_parts.append(f"High feasibility assignment ({feasibility}%)")
+            reasoning_parts.append(f"High feasibility assignment ({feasibility:.1f}%)")
         else:
-            reasoning_parts.append(f"Low feasibility assignment ({feasibility}%)")
+            reasoning_parts.append(f"Low feasibility assignment ({feasibility:.1f}%)")
         
         if unresolved_conflicts:
             reasons_str = "; ".join([c.message for c in unresolved_conflicts])
@@ -266,9 +311,72 @@ class ConflictEngine:
         else:
             reasoning_parts.append("No major conflicts detected")
         
-        reasoning = " | ".join(reasoning_parts)
+        return " | ".join(reasoning_parts)
+    
+    def propose_assignment(
+        self, mission: MissionData, pilot: PilotData, drone: DroneData,
+        cache: Optional[dict] = None, collect_all: bool = False,
+        pilot_checked: Optional[tuple] = None, need_reasoning: bool = True
+    ) -> Optional[AssignmentProposal]:
+        """Propose a single pilot-drone assignment for a mission.
+        
+        `cache` memoizes results by (mission, pilot, drone) ids so repeated
+        scans within one detection pass don't redo the checks. Unless
+        `collect_all` is set, the checks bail out (returning None) as soon as
+        the accumulated penalty puts the pair below the feasibility threshold,
+        since callers discard sub-threshold proposals anyway. `pilot_checked`
+        accepts the (conflicts, penalty) pair from _pilot_checks so grid
+        scans run the drone-independent checks once per pilot, not per pair.
+        With `need_reasoning=False` the reasoning string is left empty; grid
+        callers fill it in for the few proposals they actually return.
+        """
+        if cache is not None:
+            key = (mission.project_id, pilot.pilot_id, drone.drone_id)
+            if key in cache:
+                return cache[key]
+        
+        if pilot_checked is None:
+            pilot_checked = self._pilot_checks(pilot, mission)
+        conflicts = list(pilot_checked[0])
+        total_penalty = pilot_checked[1]
+        if not collect_all and 100 - total_penalty < self.feasibility_threshold:
+            if cache is not None:
+                cache[key] = None
+            return None
+        
+        drone_checks = (
+            (self.check_drone_availability, (drone,)),
+            (self.check_drone_capabilities, (drone, mission)),
+            (self.check_drone_location, (drone, mission)),
+        )
+        
+        for check, args in drone_checks:
+            conflict = check(*args)
+            conflicts.append(conflict)
+            if conflict.resolved:
+                continue
+            total_penalty += _PENALTY[conflict.severity_code]
+            if conflict.severity_code == 2:
+                total_penalty += 20
+            if not collect_all and 100 - total_penalty < self.feasibility_threshold:
+                if cache is not None:
+                    cache[key] = None
+                return None
+        
+        # Same formula as calculate_feasibility_score, accumulated inline
+        # above; rounding is deferred to presentation-time formatting
+        feasibility = float(max(0, 100 - total_penalty))
+        
+        # Filter to unresolved conflicts only
+        unresolved_conflicts = [c for c in conflicts if not c.resolved]
         
-        return AssignmentProposal(
+        # Most grid proposals are discarded; only build reasoning on demand
+        reasoning = (
+            self._build_reasoning(feasibility, unresolved_conflicts)
+            if need_reasoning else ""
+        )
+        
+        proposal = AssignmentProposal.model_construct(
             mission=mission,
             pilot=pilot,
             drone=drone,
@@ -276,44 +384,84 @@ class ConflictEngine:
             feasibility_score=feasibility,
             reasoning=reasoning
         )
+        if cache is not None:
+            cache[key] = proposal
+        return proposal
     
-    def find_best_assignment(
-        self, mission: MissionData, pilots: List[PilotData], drones: List[DroneData]
-    ) -> Optional[AssignmentProposal]:
-        """Find the best pilot-drone pairing for a mission."""
-        proposals = []
+    def _grid_proposals(
+        self, mission: MissionData, pilots: List[PilotData], drones: List[DroneData],
+        cache: Optional[dict] = None
+    ) -> List[AssignmentProposal]:
+        """Score every (pilot, drone) pair, keeping above-threshold proposals."""
+        # Cheap O(1) pre-filter: an unavailable pilot or drone carries a
+        # high-severity penalty (40 + 20 critical) on its own, so whenever
+        # the threshold exceeds the resulting 40-point score those rows and
+        # columns can be dropped before any checks run. Location mismatches
+        # are only medium penalties and must stay in the grid.
+        if self.feasibility_threshold > 40:
+            pilots = [p for p in pilots if p.status == _PILOT_AVAIL]
+            drones = [d for d in drones if d.status == _DRONE_AVAIL]
+            if not pilots or not drones:
+                return []
         
+        proposals = []
         for pilot in pilots:
+            # Pilot-only checks once per pilot; if their penalty alone sinks
+            # the score, no drone pairing can recover, so skip the row
+            pilot_checked = self._pilot_checks(pilot, mission)
+            if 100 - pilot_checked[1] < self.feasibility_threshold:
+                continue
             for drone in drones:
-                proposal = self.propose_assignment(mission, pilot, drone)
+                proposal = self.propose_assignment(
+                    mission, pilot, drone, cache=cache, pilot_checked=pilot_checked,
+                    need_reasoning=False
+                )
                 if proposal and proposal.feasibility_score >= self.feasibility_threshold:
                     proposals.append(proposal)
+        return proposals
+    
+    def find_best_assignment(
+        self, mission: MissionData, pilots: List[PilotData], drones: List[DroneData],
+        cache: Optional[dict] = None
+    ) -> Optional[AssignmentProposal]:
+        """Find the best pilot-drone pairing for a mission."""
+        proposals = self._grid_proposals(mission, pilots, drones, cache=cache)
         
         if not proposals:
             return None
         
-        # Sort by feasibility score, descending
-        proposals.sort(key=lambda x: x.feasibility_score, reverse=True)
-        return proposals[0]
+        # Single winner: O(N) max beats sorting the whole list
+        best = max(proposals, key=lambda x: x.feasibility_score)
+        if not best.reasoning:
+            best.reasoning = self._build_reasoning(best.feasibility_score, best.conflicts)
+        return best
     
     def find_alternatives(
         self, mission: MissionData, pilots: List[PilotData], drones: List[DroneData],
-        exclude_pilot_id: Optional[str] = None
+        exclude_pilot_id: Optional[str] = None, cache: Optional[dict] = None,
+        k: Optional[int] = None
     ) -> List[AssignmentProposal]:
-        """Find alternative assignments for a mission."""
-        proposals = []
+        """Find alternative assignments for a mission.
         
-        for pilot in pilots:
-            if exclude_pilot_id and pilot.pilot_id == exclude_pilot_id:
-                continue
-            
-            for drone in drones:
-                proposal = self.propose_assignment(mission, pilot, drone)
-                if proposal and proposal.feasibility_score >= self.feasibility_threshold:
-                    proposals.append(proposal)
+        When `k` is given, only the k best proposals are returned; that path
+        runs in O(N log k) via a heap instead of sorting everything.
+        """
+        if exclude_pilot_id:
+            pilots = [p for p in pilots if p.pilot_id != exclude_pilot_id]
+        
+        proposals = self._grid_proposals(mission, pilots, drones, cache=cache)
+        
+        if k is not None:
+            proposals = heapq.nlargest(k, proposals, key=lambda x: x.feasibility_score)
+        else:
+            # Sort by feasibility score
+            proposals.sort(key=lambda x: x.feasibility_score, reverse=True)
         
-        # Sort by feasibility score
-        proposals.sort(key=lambda x: x.feasibility_score, reverse=True)
+        for proposal in proposals:
+            if not proposal.reasoning:
+                proposal.reasoning = self._build_reasoning(
+                    proposal.feasibility_score, proposal.conflicts
+                )
         return proposals
     
     # ========================================================================
@@ -326,38 +474,35 @@ class ConflictEngine:
         """Detect all conflicts across the entire system."""
         conflicts = []
         
+        # Proposals built during this pass, shared between the best-assignment
+        # scan and the urgent-reassignment alternatives search
+        proposal_cache: dict = {}
+        
+        # Group missions by project id once so every pilot/drone lookup is O(1)
+        missions_by_project_id = {}
+        for mission in missions:
+            missions_by_project_id.setdefault(mission.project_id, []).append(mission)
+        
         # Check for double-booked pilots
         for pilot in pilots:
             # Find all missions assigned to this pilot
-            pilot_assignments = [
-                m for m in missions
-                if m.project_id == pilot.current_assignment
-            ]
+            pilot_assignments = missions_by_project_id.get(pilot.current_assignment, [])
             
-            # Check for date overlaps
-            for i in range(len(pilot_assignments)):
-                for j in range(i + 1, len(pilot_assignments)):
-                    try:
-                        start1 = datetime.strptime(pilot_assignments[i].start_date, "%Y-%m-%d")
-                        end1 = datetime.strptime(pilot_assignments[i].end_date, "%Y-%m-%d")
-                        start2 = datetime.strptime(pilot_assignments[j].start_date, "%Y-%m-%d")
-                        end2 = datetime.strptime(pilot_assignments[j].end_date, "%Y-%m-%d")
-                        
-                        # Check if date ranges overlap
-                        if start1 <= end2 and start2 <= end1:
-                            conflicts.append(ConflictDetectionResult(
-                                conflict_id=f"pilot_overlap_{pilot.pilot_id}",
-                                description=f"Pilot {pilot.name} has overlapping assignments",
-                                severity="high",
-                                affected_items=[pilot.pilot_id, pilot_assignments[i].project_id, pilot_assignments[j].project_id],
-                                recommendation=f"Reassign pilot {pilot.name} to avoid date conflict between {pilot_assignments[i].client} and {pilot_assignments[j].client}"
-                            ))
-                    except ValueError:
-                        logger.warning(f"Date parsing failed for pilot {pilot.name}")
+            # Check for date overlaps (vectorized over the pair matrix)
+            if len(pilot_assignments) > 1:
+                for i, j in _overlap_pairs(pilot_assignments):
+                    a, b = pilot_assignments[i], pilot_assignments[j]
+                    conflicts.append(ConflictDetectionResult.model_construct(
+                        conflict_id=f"pilot_overlap_{pilot.pilot_id}",
+                        description=f"Pilot {pilot.name} has overlapping assignments",
+                        severity="high",
+                        affected_items=[pilot.pilot_id, a.project_id, b.project_id],
+                        recommendation=f"Reassign pilot {pilot.name} to avoid date conflict between {a.client} and {b.client}"
+                    ))
             
             # Check if pilot is assigned to a mission but status is not 'Assigned'
             if pilot.current_assignment and not pilot_assignments:
-                conflicts.append(ConflictDetectionResult(
+                conflicts.append(ConflictDetectionResult.model_construct(
                     conflict_id=f"pilot_assignment_mismatch_{pilot.pilot_id}",
                     description=f"Pilot {pilot.name} has assignment but not in mission list",
                     severity="medium",
@@ -367,9 +512,9 @@ class ConflictEngine:
         
         # Check for low feasibility assignments
         for mission in missions:
-            best = self.find_best_assignment(mission, pilots, drones)
+            best = self.find_best_assignment(mission, pilots, drones, cache=proposal_cache)
             if best and best.feasibility_score < 60:
-                conflicts.append(ConflictDetectionResult(
+                conflicts.append(ConflictDetectionResult.model_construct(
                     conflict_id=f"low_feasibility_{mission.project_id}",
                     description=f"Mission {mission.client} has low feasibility assignment",
                     severity="medium",
@@ -377,7 +522,7 @@ class ConflictEngine:
                     recommendation=f"Consider reassignment or skill development"
                 ))
             elif not best:
-                conflicts.append(ConflictDetectionResult(
+                conflicts.append(ConflictDetectionResult.model_construct(
                     conflict_id=f"no_assignment_{mission.project_id}",
                     description=f"No suitable assignment found for {mission.client}",
                     severity="high",
@@ -388,35 +533,23 @@ class ConflictEngine:
         # Check for double-booked drones
         for drone in drones:
             # Find all missions assigned to this drone
-            drone_assignments = [
-                m for m in missions
-                if m.project_id == drone.current_assignment
-            ]
+            drone_assignments = missions_by_project_id.get(drone.current_assignment, [])
             
-            # Check for date overlaps
-            for i in range(len(drone_assignments)):
-                for j in range(i + 1, len(drone_assignments)):
-                    try:
-                        start1 = datetime.strptime(drone_assignments[i].start_date, "%Y-%m-%d")
-                        end1 = datetime.strptime(drone_assignments[i].end_date, "%Y-%m-%d")
-                        start2 = datetime.strptime(drone_assignments[j].start_date, "%Y-%m-%d")
-                        end2 = datetime.strptime(drone_assignments[j].end_date, "%Y-%m-%d")
-                        
-                        # Check if date ranges overlap
-                        if start1 <= end2 and start2 <= end1:
-                            conflicts.append(ConflictDetectionResult(
-                                conflict_id=f"drone_overlap_{drone.drone_id}",
-                                description=f"Drone {drone.model} has overlapping assignments",
-                                severity="high",
-                                affected_items=[drone.drone_id, drone_assignments[i].project_id, drone_assignments[j].project_id],
-                                recommendation=f"Reassign drone {drone.model} to avoid date conflict between {drone_assignments[i].client} and {drone_assignments[j].client}"
-                            ))
-                    except ValueError:
-                        logger.warning(f"Date parsing failed for drone {drone.model}")
+            # Check for date overlaps (vectorized over the pair matrix)
+            if len(drone_assignments) > 1:
+                for i, j in _overlap_pairs(drone_assignments):
+                    a, b = drone_assignments[i], drone_assignments[j]
+                    conflicts.append(ConflictDetectionResult.model_construct(
+                        conflict_id=f"drone_overlap_{drone.drone_id}",
+                        description=f"Drone {drone.model} has overlapping assignments",
+                        severity="high",
+                        affected_items=[drone.drone_id, a.project_id, b.project_id],
+                        recommendation=f"Reassign drone {drone.model} to avoid date conflict between {a.client} and {b.client}"
+                    ))
             
             # Check if drone is assigned to a mission but status is not 'Assigned'
             if drone.current_assignment and not drone_assignments:
-                conflicts.append(ConflictDetectionResult(
+                conflicts.append(ConflictDetectionResult.model_construct(
                     conflict_id=f"drone_assignment_mismatch_{drone.drone_id}",
                     description=f"Drone {drone.model} has assignment but not in mission list",
                     severity="medium",
@@ -424,18 +557,37 @@ class ConflictEngine:
                     recommendation=f"Update drone assignment status"
                 ))
         
-        # Handle urgent reassignments
-        urgent_reassignments = self.handle_urgent_reassignments(pilots, drones, missions, conflicts)
+        # Handle urgent reassignments, reusing the mission index built above.
+        # First-wins on duplicate project_ids, matching the next(...) scan
+        # this index replaced.
+        missions_by_id = {}
+        for m in missions:
+            missions_by_id.setdefault(m.project_id, m)
+        urgent_reassignments = self.handle_urgent_reassignments(
+            pilots, drones, missions, conflicts,
+            cache=proposal_cache, missions_by_id=missions_by_id
+        )
         conflicts.extend(urgent_reassignments)
         
         return conflicts
         
     def handle_urgent_reassignments(
         self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData], 
-        conflicts: List[ConflictDetectionResult]
+        conflicts: List[ConflictDetectionResult], cache: Optional[dict] = None,
+        missions_by_id: Optional[dict] = None
     ) -> List[ConflictDetectionResult]:
         """Handle urgent reassignments based on detected conflicts and system state."""
         urgent_actions = []
+        
+        # Index missions and current assignments once so the per-conflict and
+        # per-mission loops below do O(1) lookups instead of list scans
+        if missions_by_id is None:
+            missions_by_id = {}
+            for m in missions:
+                missions_by_id.setdefault(m.project_id, m)
+        assigned_pilot_missions = {p.current_assignment for p in pilots}
+        assigned_drone_missions = {d.current_assignment for d in drones}
+        today_ord = datetime.now().toordinal()
             
         # Identify critical conflicts that require immediate reassignment
         critical_conflicts = [c for c in conflicts if c.severity == "high"]
@@ -446,20 +598,20 @@ class ConflictEngine:
                 # Find missions that are affected
                 affected_mission_ids = [item for item in conflict.affected_items if item.startswith('PRJ')]
                 for mission_id in affected_mission_ids:
-                    mission = next((m for m in missions if m.project_id == mission_id), None)
+                    mission = missions_by_id.get(mission_id)
                     if mission:
-                        # Find alternative pilots
-                        alternatives = self.find_alternatives(mission, pilots, drones)
+                        # Find alternative pilots (only the best one is reported)
+                        alternatives = self.find_alternatives(mission, pilots, drones, cache=cache, k=1)
                         if alternatives:
-                            urgent_actions.append(ConflictDetectionResult(
+                            urgent_actions.append(ConflictDetectionResult.model_construct(
                                 conflict_id=f"urgent_reassign_pilot_{mission_id}",
                                 description=f"URGENT: Alternative pilot available for {mission.client}",
                                 severity="high",
                                 affected_items=[mission_id],
-                                recommendation=f"Immediately reassign to pilot {alternatives[0].pilot.name} with feasibility {alternatives[0].feasibility_score}%"
+                                recommendation=f"Immediately reassign to pilot {alternatives[0].pilot.name} with feasibility {alternatives[0].feasibility_score:.1f}%"
                             ))
                         else:
-                            urgent_actions.append(ConflictDetectionResult(
+                            urgent_actions.append(ConflictDetectionResult.model_construct(
                                 conflict_id=f"urgent_no_pilot_{mission_id}",
                                 description=f"URGENT: No alternative pilot available for {mission.client}",
                                 severity="critical",
@@ -471,20 +623,20 @@ class ConflictEngine:
             elif "drone" in conflict.conflict_id:
                 affected_mission_ids = [item for item in conflict.affected_items if item.startswith('PRJ')]
                 for mission_id in affected_mission_ids:
-                    mission = next((m for m in missions if m.project_id == mission_id), None)
+                    mission = missions_by_id.get(mission_id)
                     if mission:
-                        # Find alternative drones
-                        alternatives = self.find_alternatives(mission, pilots, drones)
+                        # Find alternative drones (only the best one is reported)
+                        alternatives = self.find_alternatives(mission, pilots, drones, cache=cache, k=1)
                         if alternatives:
-                            urgent_actions.append(ConflictDetectionResult(
+                            urgent_actions.append(ConflictDetectionResult.model_construct(
                                 conflict_id=f"urgent_reassign_drone_{mission_id}",
                                 description=f"URGENT: Alternative drone available for {mission.client}",
                                 severity="high",
                                 affected_items=[mission_id],
-                                recommendation=f"Immediately reassign to drone {alternatives[0].drone.model} with feasibility {alternatives[0].feasibility_score}%"
+                                recommendation=f"Immediately reassign to drone {alternatives[0].drone.model} with feasibility {alternatives[0].feasibility_score:.1f}%"
                             ))
                         else:
-                            urgent_actions.append(ConflictDetectionResult(
+                            urgent_actions.append(ConflictDetectionResult.model_construct(
                                 conflict_id=f"urgent_no_drone_{mission_id}",
                                 description=f"URGENT: No alternative drone available for {mission.client}",
                                 severity="critical",
@@ -495,31 +647,35 @@ class ConflictEngine:
         # Check for missions with critical status issues
         for mission in missions:
             # Check if mission has no assigned pilot or drone but needs to start soon
-            has_assigned_pilot = any(p.current_assignment == mission.project_id for p in pilots)
-            has_assigned_drone = any(d.current_assignment == mission.project_id for d in drones)
+            has_assigned_pilot = mission.project_id in assigned_pilot_missions
+            has_assigned_drone = mission.project_id in assigned_drone_missions
                     
-            # Only trigger urgency if mission has incomplete assignment and starts soon
+            # Only trigger urgency if mission has incomplete assignment and starts
+            # soon. Dates were validated at model construction (ordinal -1 marks
+            # unparseable input), so the comparison is a plain integer subtract.
             if not has_assigned_pilot or not has_assigned_drone:
-                try:
-                    start_date = datetime.strptime(mission.start_date, "%Y-%m-%d")
-                    days_until_start = (start_date - datetime.now()).days
-                                
-                    # If mission starts in less than 3 days and has incomplete assignment, it's urgent
-                    if 0 <= days_until_start <= 3:
-                        missing_resources = []
-                        if not has_assigned_pilot:
-                            missing_resources.append("pilot")
-                        if not has_assigned_drone:
-                            missing_resources.append("drone")
-                                    
-                        urgent_actions.append(ConflictDetectionResult(
-                            conflict_id=f"urgent_pending_mission_{mission.project_id}",
-                            description=f"URGENT: Mission {mission.client} starts in {days_until_start} days with missing {', '.join(missing_resources)}",
-                            severity="high",
-                            affected_items=[mission.project_id],
-                            recommendation="Immediately assign missing resources to meet deadline"
-                        ))
-                except ValueError:
+                if mission.start_ord < 0:
                     logger.warning(f"Date parsing failed for mission {mission.project_id}")
+                    continue
+                # The -1 keeps the pre-ordinal window: the baseline subtracted
+                # a midnight start from now() and truncated, so a start N
+                # calendar days out counted as N-1 (today was never urgent)
+                days_until_start = mission.start_ord - today_ord - 1
+
+                # If mission starts in less than 3 days and has incomplete assignment, it's urgent
+                if 0 <= days_until_start <= 3:
+                    missing_resources = []
+                    if not has_assigned_pilot:
+                        missing_resources.append("pilot")
+                    if not has_assigned_drone:
+                        missing_resources.append("drone")
+                    
+                    urgent_actions.append(ConflictDetectionResult.model_construct(
+                        conflict_id=f"urgent_pending_mission_{mission.project_id}",
+                        description=f"URGENT: Mission {mission.client} starts in {days_until_start} days with missing {', '.join(missing_resources)}",
+                        severity="high",
+                        affected_items=[mission.project_id],
+                        recommendation="Immediately assign missing resources to meet deadline"
+                    ))
             
         return urgent_actions
\ No newline at end of file
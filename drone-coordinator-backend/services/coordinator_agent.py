@@ -2,28 +2,100 @@
 AI Coordinator Agent - OpenAI-powered conversational interface
 """
 
+import asyncio
+import hashlib
 import logging
 import os
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timezone
 from typing import List, Optional
 
-from openai import OpenAI
-from models import PilotData, DroneData, MissionData
+from openai import AsyncOpenAI, OpenAI
+from models import PilotData, DroneData, MissionData, PilotStatus, DroneStatus
 
 logger = logging.getLogger(__name__)
 
+# Hoisted enum values so availability filters can't drift from the enums
+_PILOT_AVAIL = PilotStatus.AVAILABLE.value
+_DRONE_AVAIL = DroneStatus.AVAILABLE.value
+
 class CoordinatorAgent:
     """AI agent for conversational coordination powered by OpenAI."""
     
-    def __init__(self):
-        """Initialize OpenAI client."""
+    # One compiled alternation finds every intent keyword in a single scan
+    # of the message instead of one substring pass per dispatch-table entry
+    _KEYWORD_RE = re.compile(r"available|pilot|drone|status|conflict")
+    
+    # Constant instructions kept byte-identical (and first) across every
+    # request so provider-side prompt caching can reuse the tokenized prefix;
+    # the mutable fleet context rides in a separate system message after it
+    _STATIC_SYSTEM_PROMPT = """You are a Drone Operations Coordinator AI Agent for Skylark Drones.
+You help manage pilot assignments, drone fleet inventory, and mission coordination.
+
+Your responsibilities:
+1. Answer questions about pilot availability and skills
+2. Identify drone capabilities and status
+3. Suggest pilot-drone assignments for missions
+4. Detect conflicts (double-booking, skill mismatches, location issues)
+5. Handle urgent mission reassignments
+6. Provide operational status updates
+
+Keep responses concise and actionable. Use available data to make informed recommendations."""
+    
+    # Verbatim user/assistant turns kept in the prompt; older turns are
+    # folded into a rolling summary so prefill cost stays O(1) per turn
+    MAX_HISTORY_TURNS = 8
+    
+    def __init__(self, data_manager=None):
+        """Initialize OpenAI client.
+        
+        When a DataManager is supplied, the fleet context comes from its
+        cached get_context_string instead of being rebuilt here.
+        """
+        self.data_manager = data_manager
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             logger.warning("OPENAI_API_KEY not found - agent will use rule-based responses only")
         
         self.client = OpenAI(api_key=api_key) if api_key else None
+        self.async_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        # Caps concurrent in-flight completions to stay under rate limits
+        self._api_semaphore = asyncio.Semaphore(10)
         self.model = "gpt-3.5-turbo"
         self.conversation_history = []
+        # Cache keys hold the source lists themselves and are compared with
+        # "is": keeping the reference pins the object, so identity can't be
+        # recycled by a new list allocated at the same address
+        self._context_cache_src = None
+        self._context_cache = ""
+        self._history_summary = ""
+        self._avail_pilots_src = None
+        self._avail_pilots: List[PilotData] = []
+        self._avail_drones_src = None
+        self._avail_drones: List[DroneData] = []
+        # Timestamp string memoized at one-second granularity
+        self._ts_sec = 0
+        self._ts_str = ""
+        
+        # Optional Redis-backed response cache; enabled only when REDIS_URL
+        # is set and the client imports, and degrades to no caching otherwise
+        self._redis = None
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning(f"Redis response cache disabled: {e}")
+        
+        # Keyword -> handler table for the rule-based fallback; first match wins
+        self._intent_handlers = (
+            (("available", "pilot"), self._handle_available_pilots),
+            (("available", "drone"), self._handle_available_drones),
+            (("status",), self._handle_status),
+            (("conflict",), self._handle_conflicts),
+        )
     
     def process_query(
         self,
@@ -38,39 +110,24 @@ class CoordinatorAgent:
         if not self.client:
             return self._rule_based_response(user_message, pilots, drones, missions)
         
+        rule_answer = self._answer_from_rules(user_message, pilots, drones, missions)
+        if rule_answer is not None:
+            return rule_answer
+        
+        cache_key = self._response_cache_key(user_message, pilots, drones, missions)
+        cached = self._response_cache_get(cache_key)
+        if cached is not None:
+            self.conversation_history.append({"role": "user", "content": user_message})
+            self.conversation_history.append({"role": "assistant", "content": cached})
+            self._trim_history()
+            return cached
+        
         try:
-            # Prepare context
-            context = self._prepare_context(pilots, drones, missions)
+            messages = self._build_messages(user_message, pilots, drones, missions)
             
-            # Add to conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": user_message
-            })
-            
-            # Create system prompt
-            system_prompt = f"""You are a Drone Operations Coordinator AI Agent for Skylark Drones.
-You help manage pilot assignments, drone fleet inventory, and mission coordination.
-
-Current Fleet Data:
-{context}
-
-Your responsibilities:
-1. Answer questions about pilot availability and skills
-2. Identify drone capabilities and status
-3. Suggest pilot-drone assignments for missions
-4. Detect conflicts (double-booking, skill mismatches, location issues)
-5. Handle urgent mission reassignments
-6. Provide operational status updates
-
-Keep responses concise and actionable. Use available data to make informed recommendations."""
-            
-            # Get response from OpenAI
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt}
-                ] + self.conversation_history,
+                messages=messages,
                 temperature=0.7,
                 max_tokens=500
             )
@@ -83,12 +140,201 @@ Keep responses concise and actionable. Use available data to make informed recom
                 "content": assistant_message
             })
             
+            self._response_cache_set(cache_key, assistant_message)
             return assistant_message
         
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return self._rule_based_response(user_message, pilots, drones, missions)
     
+    async def process_query_async(
+        self,
+        user_message: str,
+        pilots: List[PilotData],
+        drones: List[DroneData],
+        missions: List[MissionData]
+    ) -> str:
+        """Async variant of process_query for concurrent chat sessions.
+        
+        Awaiting the async OpenAI client lets the event loop overlap the
+        network latency of simultaneous requests instead of serializing
+        them through worker threads.
+        """
+        if not self.async_client:
+            return self._rule_based_response(user_message, pilots, drones, missions)
+        
+        rule_answer = self._answer_from_rules(user_message, pilots, drones, missions)
+        if rule_answer is not None:
+            return rule_answer
+        
+        cache_key = self._response_cache_key(user_message, pilots, drones, missions)
+        cached = await asyncio.to_thread(self._response_cache_get, cache_key)
+        if cached is not None:
+            self.conversation_history.append({"role": "user", "content": user_message})
+            self.conversation_history.append({"role": "assistant", "content": cached})
+            self._trim_history()
+            return cached
+        
+        try:
+            messages = self._build_messages(user_message, pilots, drones, missions)
+            
+            async with self._api_semaphore:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=500
+                )
+            
+            assistant_message = response.choices[0].message.content
+            
+            # Add to history
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": assistant_message
+            })
+            
+            await asyncio.to_thread(self._response_cache_set, cache_key, assistant_message)
+            return assistant_message
+        
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            return self._rule_based_response(user_message, pilots, drones, missions)
+    
+    def process_query_stream(
+        self,
+        user_message: str,
+        pilots: List[PilotData],
+        drones: List[DroneData],
+        missions: List[MissionData]
+    ):
+        """Process user query, yielding the response incrementally.
+        
+        Streams tokens as OpenAI produces them so callers can show output
+        at first-token latency instead of waiting for the full completion.
+        Falls back to yielding the rule-based response in one piece.
+        """
+        if not self.client:
+            yield self._rule_based_response(user_message, pilots, drones, missions)
+            return
+        
+        rule_answer = self._answer_from_rules(user_message, pilots, drones, missions)
+        if rule_answer is not None:
+            yield rule_answer
+            return
+        
+        try:
+            messages = self._build_messages(user_message, pilots, drones, missions)
+            
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=500,
+                stream=True
+            )
+            
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            # Add to history
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": "".join(parts)
+            })
+        
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            yield self._rule_based_response(user_message, pilots, drones, missions)
+    
+    def _build_messages(
+        self,
+        user_message: str,
+        pilots: List[PilotData],
+        drones: List[DroneData],
+        missions: List[MissionData]
+    ) -> list:
+        """Record the user turn and assemble the OpenAI messages list."""
+        context = self._get_context(pilots, drones, missions)
+        
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+        self._trim_history()
+        
+        messages = [
+            {"role": "system", "content": self._STATIC_SYSTEM_PROMPT},
+            {"role": "system", "content": f"Current Fleet Data:\n{context}"},
+        ]
+        if self._history_summary:
+            messages.append({
+                "role": "system",
+                "content": f"Prior conversation summary:\n{self._history_summary}"
+            })
+        messages.extend(self.conversation_history)
+        return messages
+    
+    def _get_context(
+        self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        """Fleet context memoized per data snapshot.
+        
+        DataManager rebuilds its lists on every load/sync, so list identity
+        is a cheap, reliable change key: unchanged fleets across chat turns
+        reuse the string (and keep the system prompt byte-identical, which
+        also lets the OpenAI prompt cache hit).
+        """
+        if self.data_manager is not None:
+            return self.data_manager.get_context_string()
+        
+        src = self._context_cache_src
+        if (src is None or src[0] is not pilots
+                or src[1] is not drones or src[2] is not missions):
+            self._context_cache = self._prepare_context(pilots, drones, missions)
+            self._context_cache_src = (pilots, drones, missions)
+        return self._context_cache
+
+    def invalidate_context_cache(self):
+        """Force the next query to rebuild the fleet context."""
+        self._context_cache_src = None
+        self._avail_pilots_src = None
+        self._avail_drones_src = None
+
+    def _available_pilots(self, pilots: List[PilotData]) -> List[PilotData]:
+        """Available pilots, filtered once per data snapshot (keyed like the
+        context cache on list identity, which changes on every load/sync)."""
+        if pilots is not self._avail_pilots_src:
+            self._avail_pilots = [p for p in pilots if p.status == _PILOT_AVAIL]
+            self._avail_pilots_src = pilots
+        return self._avail_pilots
+
+    def _available_drones(self, drones: List[DroneData]) -> List[DroneData]:
+        """Available drones, filtered once per data snapshot."""
+        if drones is not self._avail_drones_src:
+            self._avail_drones = [d for d in drones if d.status == _DRONE_AVAIL]
+            self._avail_drones_src = drones
+        return self._avail_drones
+    
+    def _trim_history(self):
+        """Cap history to the recent window, folding evicted turns into
+        a one-block summary so long sessions don't grow the prompt."""
+        max_messages = 2 * self.MAX_HISTORY_TURNS
+        if len(self.conversation_history) <= max_messages:
+            return
+        
+        evicted = self.conversation_history[:-max_messages]
+        self.conversation_history = self.conversation_history[-max_messages:]
+        
+        lines = [self._history_summary] if self._history_summary else []
+        lines.extend(f"{m['role']}: {m['content']}" for m in evicted)
+        # Keep the tail; old detail ages out as the summary itself grows
+        self._history_summary = "\n".join(lines)[-2000:]
+    
     def _prepare_context(
         self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
     ) -> str:
@@ -97,7 +343,7 @@ Keep responses concise and actionable. Use available data to make informed recom
         
         # Pilots summary
         context_lines.append("PILOTS:")
-        available_pilots = [p for p in pilots if p.status == "Available"]
+        available_pilots = self._available_pilots(pilots)
         context_lines.append(f"  - Total: {len(pilots)}, Available: {len(available_pilots)}")
         for pilot in available_pilots[:5]:  # Show first 5
             skills = ", ".join(pilot.skills) if pilot.skills else "General"
@@ -105,7 +351,7 @@ Keep responses concise and actionable. Use available data to make informed recom
         
         # Drones summary
         context_lines.append("\nDRONES:")
-        available_drones = [d for d in drones if d.status == "Available"]
+        available_drones = self._available_drones(drones)
         context_lines.append(f"  - Total: {len(drones)}, Available: {len(available_drones)}")
         for drone in available_drones[:5]:  # Show first 5
             capabilities = ", ".join(drone.capabilities) if drone.capabilities else "RGB"
@@ -119,57 +365,74 @@ Keep responses concise and actionable. Use available data to make informed recom
         
         return "\n".join(context_lines)
     
+    def _response_cache_key(
+        self, user_message: str, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        """Cache key over the fleet context and the message, so a data
+        change (new context string) naturally invalidates old entries."""
+        context = self._get_context(pilots, drones, missions)
+        digest = hashlib.sha256(f"{context}\x00{user_message}".encode()).hexdigest()
+        return f"llm:{digest[:32]}"
+    
+    def _response_cache_get(self, key: str) -> Optional[str]:
+        """Cached response text, or None on miss / when Redis is unusable."""
+        if self._redis is None:
+            return None
+        try:
+            cached = self._redis.get(key)
+            return cached.decode() if cached is not None else None
+        except Exception as e:
+            logger.warning(f"Redis read failed, skipping cache: {e}")
+            return None
+    
+    def _response_cache_set(self, key: str, value: str, ttl: int = 3600):
+        """Store a response, ignoring Redis failures."""
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(key, ttl, value)
+        except Exception as e:
+            logger.warning(f"Redis write failed, skipping cache: {e}")
+    
+    def _match_rule(
+        self, user_message: str, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> Optional[str]:
+        """Answer from the dispatch table, or None when no intent matches."""
+        hits = set(self._KEYWORD_RE.findall(user_message.lower()))
+        if not hits:
+            return None
+        
+        for keywords, handler in self._intent_handlers:
+            if hits.issuperset(keywords):
+                return handler(pilots, drones, missions)
+        return None
+    
+    def _answer_from_rules(
+        self, user_message: str, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> Optional[str]:
+        """Short-circuit queries the rules answer confidently.
+        
+        Status/availability/conflict questions read directly from fleet
+        data, so spending an LLM round-trip on them buys nothing. Matched
+        turns are still recorded in history so follow-up questions keep
+        their context.
+        """
+        answer = self._match_rule(user_message, pilots, drones, missions)
+        if answer is None:
+            return None
+        
+        self.conversation_history.append({"role": "user", "content": user_message})
+        self.conversation_history.append({"role": "assistant", "content": answer})
+        self._trim_history()
+        return answer
+    
     def _rule_based_response(
         self, user_message: str, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
     ) -> str:
         """Generate rule-based response when OpenAI is unavailable."""
-        message_lower = user_message.lower()
-        
-        # Available pilots
-        if "available" in message_lower and "pilot" in message_lower:
-            available = [p for p in pilots if p.status == "Available"]
-            if not available:
-                return "No pilots are currently available."
-            return "Available pilots:\n" + "\n".join([
-                f"• {p.name} ({p.location}): {', '.join(p.skills) if p.skills else 'General flying'}"
-                for p in available
-            ])
-        
-        # Available drones
-        if "available" in message_lower and "drone" in message_lower:
-            available = [d for d in drones if d.status == "Available"]
-            if not available:
-                return "No drones are currently available."
-            return "Available drones:\n" + "\n".join([
-                f"• {d.model} ({d.location}): {', '.join(d.capabilities) if d.capabilities else 'RGB capability'}"
-                for d in available
-            ])
-        
-        # Status overview
-        if "status" in message_lower:
-            available_pilots = len([p for p in pilots if p.status == "Available"])
-            available_drones = len([d for d in drones if d.status == "Available"])
-            return f"""**Operations Status:**
-- Total Pilots: {len(pilots)} (Available: {available_pilots})
-- Total Drones: {len(drones)} (Available: {available_drones})
-- Total Missions: {len(missions)}
-
-Ready to help with assignments and conflict resolution."""
-        
-        # Conflicts
-        if "conflict" in message_lower:
-            pilot_issues = [p for p in pilots if p.status != "Available"]
-            drone_issues = [d for d in drones if d.status != "Available"]
-            
-            issues = []
-            if pilot_issues:
-                issues.append(f"Unavailable pilots ({len(pilot_issues)}): {', '.join([p.name for p in pilot_issues])}")
-            if drone_issues:
-                issues.append(f"Unavailable drones ({len(drone_issues)}): {', '.join([d.model for d in drone_issues])}")
-            
-            if not issues:
-                return "No major conflicts detected. All pilots and drones are ready."
-            return "**Potential Conflicts Detected:**\n" + "\n".join([f"• {issue}" for issue in issues])
+        matched = self._match_rule(user_message, pilots, drones, missions)
+        if matched is not None:
+            return matched
         
         # Default response
         return """I can help with:
@@ -181,10 +444,70 @@ Ready to help with assignments and conflict resolution."""
 
 What would you like to know?"""
     
+    def _handle_available_pilots(
+        self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        available = self._available_pilots(pilots)
+        if not available:
+            return "No pilots are currently available."
+        return "Available pilots:\n" + "\n".join([
+            f"• {p.name} ({p.location}): {', '.join(p.skills) if p.skills else 'General flying'}"
+            for p in available
+        ])
+    
+    def _handle_available_drones(
+        self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        available = self._available_drones(drones)
+        if not available:
+            return "No drones are currently available."
+        return "Available drones:\n" + "\n".join([
+            f"• {d.model} ({d.location}): {', '.join(d.capabilities) if d.capabilities else 'RGB capability'}"
+            for d in available
+        ])
+    
+    def _handle_status(
+        self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        available_pilots = len(self._available_pilots(pilots))
+        available_drones = len(self._available_drones(drones))
+        return f"""**Operations Status:**
+- Total Pilots: {len(pilots)} (Available: {available_pilots})
+- Total Drones: {len(drones)} (Available: {available_drones})
+- Total Missions: {len(missions)}
+
+Ready to help with assignments and conflict resolution."""
+    
+    def _handle_conflicts(
+        self, pilots: List[PilotData], drones: List[DroneData], missions: List[MissionData]
+    ) -> str:
+        pilot_issues = [p for p in pilots if p.status != _PILOT_AVAIL]
+        drone_issues = [d for d in drones if d.status != _DRONE_AVAIL]
+        
+        issues = []
+        if pilot_issues:
+            issues.append(f"Unavailable pilots ({len(pilot_issues)}): {', '.join([p.name for p in pilot_issues])}")
+        if drone_issues:
+            issues.append(f"Unavailable drones ({len(drone_issues)}): {', '.join([d.model for d in drone_issues])}")
+        
+        if not issues:
+            return "No major conflicts detected. All pilots and drones are ready."
+        return "**Potential Conflicts Detected:**\n" + "\n".join([f"• {issue}" for issue in issues])
+    
     def get_timestamp(self) -> str:
-        """Get current timestamp."""
-        return datetime.now().isoformat()
+        """Get current timestamp (memoized per second).
+        
+        The string only carries second precision, so within the same second
+        repeated callers get the cached value instead of a fresh datetime
+        allocation and isoformat render each time.
+        """
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            self._ts_str = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        return self._ts_str
     
     def clear_history(self):
         """Clear conversation history."""
         self.conversation_history = []
+        self._history_summary = ""
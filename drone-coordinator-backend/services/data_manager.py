@@ -2,17 +2,28 @@
 Data management service - handles CSV and Google Sheets sync
 """
 
-import pandas as pd
+import csv
+import orjson
 import os
 import logging
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from datetime import datetime
 from pathlib import Path
 
-from models import PilotData, DroneData, MissionData
+from models import PilotData, DroneData, MissionData, PilotStatus, DroneStatus
 
 logger = logging.getLogger(__name__)
 
+# Hoisted enum values so availability filters can't drift from the enums
+_PILOT_AVAIL = PilotStatus.AVAILABLE.value
+_DRONE_AVAIL = DroneStatus.AVAILABLE.value
+
+# Splits comma-separated cells and eats the surrounding whitespace in one pass
+_SPLIT_RE = re.compile(r"\s*,\s*")
+
 class DataManager:
     """Manages data loading from CSV and Google Sheets."""
     
@@ -25,6 +36,17 @@ class DataManager:
         self._pilots: List[PilotData] = []
         self._drones: List[DroneData] = []
         self._missions: List[MissionData] = []
+        self._pilots_by_id: dict = {}
+        self._drones_by_id: dict = {}
+        self._missions_by_id: dict = {}
+        self._available_pilots: List[PilotData] = []
+        self._available_drones: List[DroneData] = []
+        self._pilots_json: Optional[bytes] = None
+        self._drones_json: Optional[bytes] = None
+        self._missions_json: Optional[bytes] = None
+        self._version = 0
+        self._context_string: Optional[str] = None
+        self._sheets_service = None
         
         self.last_sync_time = None
         self.load_from_csv()
@@ -38,98 +60,148 @@ class DataManager:
         try:
             logger.info("Loading data from CSV files...")
             
-            # Load pilots
-            if os.path.exists(self.pilots_csv):
-                pilots_df = pd.read_csv(self.pilots_csv)
-                self._pilots = self._parse_pilots_csv(pilots_df)
-                logger.info(f"Loaded {len(self._pilots)} pilots from CSV")
+            # The three files parse independently, so load them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                pilots_future = executor.submit(
+                    self._load_csv, self.pilots_csv, self._parse_pilot_rows
+                )
+                drones_future = executor.submit(
+                    self._load_csv, self.drones_csv, self._parse_drone_rows
+                )
+                missions_future = executor.submit(
+                    self._load_csv, self.missions_csv, self._parse_mission_rows
+                )
+                pilots = pilots_future.result()
+                drones = drones_future.result()
+                missions = missions_future.result()
             
-            # Load drones
-            if os.path.exists(self.drones_csv):
-                drones_df = pd.read_csv(self.drones_csv)
-                self._drones = self._parse_drones_csv(drones_df)
+            if pilots is not None:
+                self._set_pilots(pilots)
+                logger.info(f"Loaded {len(self._pilots)} pilots from CSV")
+            if drones is not None:
+                self._set_drones(drones)
                 logger.info(f"Loaded {len(self._drones)} drones from CSV")
-            
-            # Load missions
-            if os.path.exists(self.missions_csv):
-                missions_df = pd.read_csv(self.missions_csv)
-                self._missions = self._parse_missions_csv(missions_df)
+            if missions is not None:
+                self._set_missions(missions)
                 logger.info(f"Loaded {len(self._missions)} missions from CSV")
             
+            self._refresh_availability()
             self.last_sync_time = datetime.now().isoformat()
             return True
         except Exception as e:
             logger.error(f"Failed to load CSV: {e}")
             return False
     
-    def _parse_pilots_csv(self, df: pd.DataFrame) -> List[PilotData]:
-        """Parse pilots DataFrame into model objects."""
+    @staticmethod
+    def _load_csv(path: str, parser) -> Optional[list]:
+        """Read and parse one CSV; None when the file does not exist.
+        
+        The few-column rosters here don't need pandas: csv.DictReader
+        avoids the heavyweight import and per-row Series overhead.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return parser(csv.DictReader(f))
+    
+    @staticmethod
+    def _split_cell(value) -> list:
+        """Comma-separated cell as a list of stripped, interned tokens.
+        
+        Interning collapses the heavy cross-row duplication of skill/cert/
+        capability names to one shared object per distinct value.
+        """
+        if not value:
+            return []
+        return [sys.intern(p) for p in _SPLIT_RE.split(str(value).strip()) if p]
+    
+    def _parse_pilot_rows(self, rows) -> List[PilotData]:
+        """Build pilots from dict rows (csv.DictReader or sheet rows)."""
         pilots = []
-        for _, row in df.iterrows():
+        for row in rows:
             try:
-                # Handle skills and certifications as comma-separated values
-                skills = [s.strip() for s in str(row['skills']).split(',')] if pd.notna(row.get('skills')) else []
-                certs = [c.strip() for c in str(row['certifications']).split(',')] if pd.notna(row.get('certifications')) else []
-                
-                pilot = PilotData(
-                    pilot_id=str(row['pilot_id']),
-                    name=str(row['name']),
-                    skills=skills,
-                    certifications=certs,
-                    location=str(row['location']),
-                    status=str(row.get('status', 'Available')),
-                    current_assignment=row.get('current_assignment') if pd.notna(row.get('current_assignment')) else None,
-                    available_from=str(row.get('available_from', ''))
-                )
-                pilots.append(pilot)
+                pilots.append(PilotData(
+                    pilot_id=str(row.get('pilot_id', '')),
+                    name=str(row.get('name', '')),
+                    skills=self._split_cell(row.get('skills')),
+                    certifications=self._split_cell(row.get('certifications')),
+                    location=sys.intern(str(row.get('location', ''))),
+                    status=str(row.get('status') or 'Available'),
+                    current_assignment=row.get('current_assignment') or None,
+                    available_from=str(row.get('available_from') or '')
+                ))
             except Exception as e:
                 logger.warning(f"Failed to parse pilot row: {e}")
         return pilots
     
-    def _parse_drones_csv(self, df: pd.DataFrame) -> List[DroneData]:
-        """Parse drones DataFrame into model objects."""
+    def _parse_drone_rows(self, rows) -> List[DroneData]:
+        """Build drones from dict rows (csv.DictReader or sheet rows)."""
         drones = []
-        for _, row in df.iterrows():
+        for row in rows:
             try:
-                capabilities = [c.strip() for c in str(row['capabilities']).split(',')] if pd.notna(row.get('capabilities')) else []
-                
-                drone = DroneData(
-                    drone_id=str(row['drone_id']),
-                    model=str(row['model']),
-                    capabilities=capabilities,
-                    status=str(row.get('status', 'Available')),
-                    location=str(row['location']),
-                    current_assignment=row.get('current_assignment') if pd.notna(row.get('current_assignment')) else None,
-                    maintenance_due=str(row.get('maintenance_due', ''))
-                )
-                drones.append(drone)
+                drones.append(DroneData(
+                    drone_id=str(row.get('drone_id', '')),
+                    model=str(row.get('model', '')),
+                    capabilities=self._split_cell(row.get('capabilities')),
+                    status=str(row.get('status') or 'Available'),
+                    location=sys.intern(str(row.get('location', ''))),
+                    current_assignment=row.get('current_assignment') or None,
+                    maintenance_due=str(row.get('maintenance_due') or '')
+                ))
             except Exception as e:
                 logger.warning(f"Failed to parse drone row: {e}")
         return drones
     
-    def _parse_missions_csv(self, df: pd.DataFrame) -> List[MissionData]:
-        """Parse missions DataFrame into model objects."""
+    def _parse_mission_rows(self, rows) -> List[MissionData]:
+        """Build missions from dict rows (csv.DictReader or sheet rows)."""
         missions = []
-        for _, row in df.iterrows():
+        for row in rows:
             try:
-                skills = [s.strip() for s in str(row['required_skills']).split(',')] if pd.notna(row.get('required_skills')) else []
-                certs = [c.strip() for c in str(row['required_certs']).split(',')] if pd.notna(row.get('required_certs')) else []
-                
-                mission = MissionData(
-                    project_id=str(row['project_id']),
-                    client=str(row['client']),
-                    location=str(row['location']),
-                    required_skills=skills,
-                    required_certs=certs,
-                    start_date=str(row['start_date']),
-                    end_date=str(row['end_date']),
-                    priority=str(row.get('priority', 'Standard'))
-                )
-                missions.append(mission)
+                missions.append(MissionData(
+                    project_id=str(row.get('project_id', '')),
+                    client=str(row.get('client', '')),
+                    location=sys.intern(str(row.get('location', ''))),
+                    required_skills=self._split_cell(row.get('required_skills')),
+                    required_certs=self._split_cell(row.get('required_certs')),
+                    start_date=str(row.get('start_date', '')),
+                    end_date=str(row.get('end_date', '')),
+                    priority=str(row.get('priority') or 'Standard')
+                ))
             except Exception as e:
                 logger.warning(f"Failed to parse mission row: {e}")
         return missions
     
+    def _set_pilots(self, pilots: List[PilotData]):
+        """Replace the pilot list and rebuild its id index together."""
+        self._pilots = pilots
+        self._pilots_by_id = {p.pilot_id: p for p in pilots}
+    
+    def _set_drones(self, drones: List[DroneData]):
+        """Replace the drone list and rebuild its id index together."""
+        self._drones = drones
+        self._drones_by_id = {d.drone_id: d for d in drones}
+    
+    def _set_missions(self, missions: List[MissionData]):
+        """Replace the mission list and rebuild its id index together."""
+        self._missions = missions
+        self._missions_by_id = {m.project_id: m for m in missions}
+    
+    def _refresh_availability(self):
+        """Recompute availability caches so read paths never re-filter."""
+        self._available_pilots = [
+            p for p in self._pilots if p.status == _PILOT_AVAIL
+        ]
+        self._available_drones = [
+            d for d in self._drones if d.status == _DRONE_AVAIL
+        ]
+        # Drop pre-serialized payloads and the agent context; they are
+        # rebuilt lazily on next read
+        self._pilots_json = None
+        self._drones_json = None
+        self._missions_json = None
+        self._context_string = None
+        self._version += 1
+    
     # ========================================================================
     # GETTER METHODS
     # ========================================================================
@@ -146,46 +218,106 @@ class DataManager:
         """Get all missions."""
         return self._missions
     
+    @property
+    def version(self) -> int:
+        """Monotonic data version, bumped on every load/sync (used for ETags)."""
+        return self._version
+    
+    def get_available_pilots(self) -> List[PilotData]:
+        """Get available pilots (precomputed at load/sync time)."""
+        return self._available_pilots
+    
+    def get_available_drones(self) -> List[DroneData]:
+        """Get available drones (precomputed at load/sync time)."""
+        return self._available_drones
+    
+    def pilots_json(self) -> bytes:
+        """Pre-serialized pilots payload, rebuilt lazily after each load/sync."""
+        if self._pilots_json is None:
+            self._pilots_json = orjson.dumps([p.model_dump() for p in self._pilots])
+        return self._pilots_json
+    
+    def drones_json(self) -> bytes:
+        """Pre-serialized drones payload, rebuilt lazily after each load/sync."""
+        if self._drones_json is None:
+            self._drones_json = orjson.dumps([d.model_dump() for d in self._drones])
+        return self._drones_json
+    
+    def missions_json(self) -> bytes:
+        """Pre-serialized missions payload, rebuilt lazily after each load/sync."""
+        if self._missions_json is None:
+            self._missions_json = orjson.dumps([m.model_dump() for m in self._missions])
+        return self._missions_json
+    
+    def get_context_string(self) -> str:
+        """Fleet summary for the agent's prompt, cached until the next
+        load/sync (same invalidation as the pre-serialized payloads)."""
+        if self._context_string is None:
+            lines = ["PILOTS:"]
+            lines.append(
+                f"  - Total: {len(self._pilots)}, Available: {len(self._available_pilots)}"
+            )
+            for pilot in self._available_pilots[:5]:  # Show first 5
+                skills = ", ".join(pilot.skills) if pilot.skills else "General"
+                lines.append(f"    • {pilot.name} ({pilot.location}): {skills}")
+            
+            lines.append("\nDRONES:")
+            lines.append(
+                f"  - Total: {len(self._drones)}, Available: {len(self._available_drones)}"
+            )
+            for drone in self._available_drones[:5]:  # Show first 5
+                capabilities = ", ".join(drone.capabilities) if drone.capabilities else "RGB"
+                lines.append(f"    • {drone.model} ({drone.location}): {capabilities}")
+            
+            lines.append("\nMISSIONS:")
+            lines.append(f"  - Total: {len(self._missions)}")
+            for mission in self._missions[:5]:  # Show first 5
+                lines.append(
+                    f"    • {mission.client} ({mission.location}): Priority={mission.priority}"
+                )
+            
+            self._context_string = "\n".join(lines)
+        return self._context_string
+    
     def get_pilot_by_id(self, pilot_id: str) -> Optional[PilotData]:
-        """Get pilot by ID."""
-        for pilot in self._pilots:
-            if pilot.pilot_id == pilot_id:
-                return pilot
-        return None
+        """Get pilot by ID (O(1) via the index kept by _set_pilots)."""
+        return self._pilots_by_id.get(pilot_id)
     
     def get_drone_by_id(self, drone_id: str) -> Optional[DroneData]:
-        """Get drone by ID."""
-        for drone in self._drones:
-            if drone.drone_id == drone_id:
-                return drone
-        return None
+        """Get drone by ID (O(1) via the index kept by _set_drones)."""
+        return self._drones_by_id.get(drone_id)
     
     def get_mission_by_id(self, mission_id: str) -> Optional[MissionData]:
-        """Get mission by ID."""
-        for mission in self._missions:
-            if mission.project_id == mission_id:
-                return mission
-        return None
+        """Get mission by ID (O(1) via the index kept by _set_missions)."""
+        return self._missions_by_id.get(mission_id)
     
     # ========================================================================
     # GOOGLE SHEETS SYNC (TODO - implement with google-api-python-client)
     # ========================================================================
     
-    def sync_from_google_sheets(self) -> dict:
-        """Sync data from Google Sheets."""
-        try:
+    def _get_sheets_service(self):
+        """Sheets API client, built once and reused across syncs.
+        
+        Credential loading plus discovery build costs hundreds of
+        milliseconds; repeated syncs skip it. The cache is dropped when the
+        credentials file goes missing so a replaced file is picked up.
+        """
+        if self._sheets_service is None:
             from google.oauth2.service_account import Credentials
             from googleapiclient.discovery import build
             
-            # Load credentials
             credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS", "./credentials.json")
             credentials = Credentials.from_service_account_file(
                 credentials_path,
                 scopes=['https://www.googleapis.com/auth/spreadsheets']
             )
-            
-            # Create Sheets API client
-            service = build('sheets', 'v4', credentials=credentials)
+            self._sheets_service = build('sheets', 'v4', credentials=credentials)
+        return self._sheets_service
+    
+    def sync_from_google_sheets(self) -> dict:
+        """Sync data from Google Sheets."""
+        try:
+            service = self._get_sheets_service()
             sheet_id = os.getenv("GOOGLE_SHEET_ID")
             
             if not sheet_id:
@@ -209,33 +341,33 @@ class DataManager:
             
             values = result.get('valueRanges', [])
             
+            # Sheet ranges arrive as lists of lists; zip each data row with
+            # the header row to get the same dict rows csv.DictReader yields
             # Parse pilots
             if len(values) > 0 and values[0].get('values'):
-                pilots_df = pd.DataFrame(
-                    values[0]['values'][1:],  # Skip header
-                    columns=values[0]['values'][0]
-                )
-                self._pilots = self._parse_pilots_csv(pilots_df)
+                header, *rows = values[0]['values']
+                self._set_pilots(self._parse_pilot_rows(
+                    dict(zip(header, row)) for row in rows
+                ))
                 logger.info(f"Loaded {len(self._pilots)} pilots from Google Sheets")
             
             # Parse drones
             if len(values) > 1 and values[1].get('values'):
-                drones_df = pd.DataFrame(
-                    values[1]['values'][1:],
-                    columns=values[1]['values'][0]
-                )
-                self._drones = self._parse_drones_csv(drones_df)
+                header, *rows = values[1]['values']
+                self._set_drones(self._parse_drone_rows(
+                    dict(zip(header, row)) for row in rows
+                ))
                 logger.info(f"Loaded {len(self._drones)} drones from Google Sheets")
             
             # Parse missions
             if len(values) > 2 and values[2].get('values'):
-                missions_df = pd.DataFrame(
-                    values[2]['values'][1:],
-                    columns=values[2]['values'][0]
-                )
-                self._missions = self._parse_missions_csv(missions_df)
+                header, *rows = values[2]['values']
+                self._set_missions(self._parse_mission_rows(
+                    dict(zip(header, row)) for row in rows
+                ))
                 logger.info(f"Loaded {len(self._missions)} missions from Google Sheets")
             
+            self._refresh_availability()
             self.last_sync_time = datetime.now().isoformat()
             logger.info("✅ Successfully synced from Google Sheets")
             return {"status": "success", "synced_from": "google_sheets", "records": {
@@ -247,6 +379,7 @@ class DataManager:
         except FileNotFoundError:
             logger.error("Google Sheets credentials file not found")
             logger.info("Falling back to CSV files")
+            self._sheets_service = None
             self.load_from_csv()
             return {"status": "fallback_to_csv", "error": "Credentials file not found"}
         except Exception as e:
@@ -258,26 +391,17 @@ class DataManager:
     def sync_to_google_sheets(self) -> dict:
         """Sync local data back to Google Sheets."""
         try:
-            from google.oauth2.service_account import Credentials
-            from googleapiclient.discovery import build
-            
-            # Load credentials
-            credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS", "./credentials.json")
-            credentials = Credentials.from_service_account_file(
-                credentials_path,
-                scopes=['https://www.googleapis.com/auth/spreadsheets']
-            )
-            
-            # Create Sheets API client
-            service = build('sheets', 'v4', credentials=credentials)
+            service = self._get_sheets_service()
             sheet_id = os.getenv("GOOGLE_SHEET_ID")
             
             if not sheet_id:
                 logger.error("GOOGLE_SHEET_ID not set in environment variables")
                 return {"status": "error", "message": "GOOGLE_SHEET_ID not configured"}
             
-            # Get sheet name from environment variable
+            # Get sheet names from environment variables
             pilots_sheet_name = os.getenv("PILOTS_SHEET_NAME", "Pilot Roster")
+            drones_sheet_name = os.getenv("DRONES_SHEET_NAME", "Drone Fleet")
+            missions_sheet_name = os.getenv("MISSIONS_SHEET_NAME", "Missions")
             
             # Prepare pilot data for upload
             pilot_values = [['pilot_id', 'name', 'skills', 'certifications', 'location', 'status', 'current_assignment', 'available_from']]
@@ -293,23 +417,7 @@ class DataManager:
                     pilot.available_from
                 ])
             
-            # Update Pilot Roster sheet
-            range_name = f'"{pilots_sheet_name}"!A:H'
-            body = {
-                'values': pilot_values
-            }
-            
-            result = service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=range_name,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
-            
-            logger.info(f"✅ Successfully updated Pilot Roster with {len(self._pilots)} records")
-            
-            # Also update drones if needed
-            drones_sheet_name = os.getenv("DRONES_SHEET_NAME", "Drone Fleet")
+            # Prepare drone data for upload
             drone_values = [['drone_id', 'model', 'capabilities', 'status', 'location', 'current_assignment', 'maintenance_due', '']]  # Last column empty
             for drone in self._drones:
                 drone_values.append([
@@ -323,23 +431,7 @@ class DataManager:
                     ''  # Empty last column
                 ])
             
-            # Update Drone Fleet sheet
-            drone_range_name = f'"{drones_sheet_name}"!A:H'
-            drone_body = {
-                'values': drone_values
-            }
-            
-            drone_result = service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=drone_range_name,
-                valueInputOption='RAW',
-                body=drone_body
-            ).execute()
-            
-            logger.info(f"✅ Successfully updated Drone Fleet with {len(self._drones)} records")
-            
-            # Also update missions if needed
-            missions_sheet_name = os.getenv("MISSIONS_SHEET_NAME", "Missions")
+            # Prepare mission data for upload
             mission_values = [['project_id', 'client', 'location', 'required_skills', 'required_certs', 'start_date', 'end_date', 'priority']]
             for mission in self._missions:
                 mission_values.append([
@@ -353,20 +445,25 @@ class DataManager:
                     mission.priority
                 ])
             
-            # Update Missions sheet
-            mission_range_name = f'"{missions_sheet_name}"!A:H'
-            mission_body = {
-                'values': mission_values
+            # Write all three sheets in one batched HTTP round-trip
+            body = {
+                'valueInputOption': 'RAW',
+                'data': [
+                    {'range': f'"{pilots_sheet_name}"!A:H', 'values': pilot_values},
+                    {'range': f'"{drones_sheet_name}"!A:H', 'values': drone_values},
+                    {'range': f'"{missions_sheet_name}"!A:H', 'values': mission_values}
+                ]
             }
             
-            mission_result = service.spreadsheets().values().update(
+            result = service.spreadsheets().values().batchUpdate(
                 spreadsheetId=sheet_id,
-                range=mission_range_name,
-                valueInputOption='RAW',
-                body=mission_body
+                body=body
             ).execute()
             
-            logger.info(f"✅ Successfully updated Missions with {len(self._missions)} records")
+            logger.info(
+                f"✅ Successfully updated {len(self._pilots)} pilots, "
+                f"{len(self._drones)} drones, {len(self._missions)} missions in one batch"
+            )
             
             return {
                 "status": "success",
@@ -376,12 +473,11 @@ class DataManager:
                     "drones": len(self._drones),
                     "missions": len(self._missions)
                 },
-                "pilots_updated": result.get('updatedCells', 0),
-                "drones_updated": drone_result.get('updatedCells', 0),
-                "missions_updated": mission_result.get('updatedCells', 0)
+                "total_updated_cells": result.get('totalUpdatedCells', 0)
             }
         except FileNotFoundError:
             logger.error("Google Sheets credentials file not found")
+            self._sheets_service = None
             return {"status": "error", "message": "Credentials file not found"}
         except Exception as e:
             logger.error(f"Google Sheets write sync failed: {e}")